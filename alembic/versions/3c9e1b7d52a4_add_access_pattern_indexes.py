@@ -0,0 +1,130 @@
+"""Add composite, partial and trigram indexes for hot queries
+
+Revision ID: 3c9e1b7d52a4
+Revises: adcf34458771
+Create Date: 2026-10-17 10:12:41.318204
+
+Every index here mirrors a query the repositories actually run:
+
+  bills (user_id, billing_period_start, id)      get_my_bills ordered by period
+  bills (user_id, created_at, id)                get_my_bills default ordering
+  bills (user_id, billing_period_end)
+      WHERE parse_status = 'SUCCESS'             get_latest_by_user
+  bills (user_id, checksum)
+      WHERE checksum IS NOT NULL                 get_by_checksum
+  user_appliances (user_id, custom_name)         get_by_name
+  user_appliances (user_id, created_at, id)      get_by_user
+  GIN gin_trgm_ops on bills.provider,
+      users.email/username/first_name            ILIKE '%term%' search filters
+
+The trailing id column matches the (order column, id) keyset used by the
+paginated lists, so cursor pages are answered straight from the index.
+
+Indexes are built CONCURRENTLY so the tables stay writable while this runs
+on a populated database; that has to happen outside a transaction, hence
+the autocommit blocks. Use scripts/benchmark_indexes.py to compare plans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e1b7d52a4"
+down_revision: Union[str, Sequence[str], None] = "adcf34458771"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, extra create_index kwargs)
+BTREE_INDEXES = [
+    (
+        "ix_bills_user_id_billing_period_start",
+        "bills",
+        ["user_id", "billing_period_start", "id"],
+        {},
+    ),
+    ("ix_bills_user_id_created_at", "bills", ["user_id", "created_at", "id"], {}),
+    (
+        "ix_bills_user_id_latest_success",
+        "bills",
+        ["user_id", "billing_period_end"],
+        {"postgresql_where": sa.text("parse_status = 'SUCCESS'")},
+    ),
+    (
+        "ix_bills_user_id_checksum",
+        "bills",
+        ["user_id", "checksum"],
+        {"postgresql_where": sa.text("checksum IS NOT NULL")},
+    ),
+    (
+        "ix_user_appliances_user_id_custom_name",
+        "user_appliances",
+        ["user_id", "custom_name"],
+        {},
+    ),
+    (
+        "ix_user_appliances_user_id_created_at",
+        "user_appliances",
+        ["user_id", "created_at", "id"],
+        {},
+    ),
+]
+
+# (name, table, column)
+TRIGRAM_INDEXES = [
+    ("ix_bills_provider_trgm", "bills", "provider"),
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_users_username_trgm", "users", "username"),
+    ("ix_users_first_name_trgm", "users", "first_name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in BTREE_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                **kwargs,
+            )
+
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                if_not_exists=True,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _column in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+        for name, table, _columns, _kwargs in reversed(BTREE_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+    # pg_trgm is left installed; other objects in the database may use it
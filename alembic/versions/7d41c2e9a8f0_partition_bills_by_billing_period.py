@@ -0,0 +1,254 @@
+"""Partition bills and appliance_estimates by billing_period_start
+
+Revision ID: 7d41c2e9a8f0
+Revises: 3c9e1b7d52a4
+Create Date: 2026-10-17 14:03:55.702931
+
+Always applied: appliance_estimates gets billing_period_start, copied from its
+bill. It is the key estimates are co-located on and the model sets it.
+
+Opt-in (run with BILL_PARTITIONING_ENABLED=true): bills and
+appliance_estimates are rebuilt as tables range-partitioned by
+billing_period_start, one partition per year plus a DEFAULT partition (see
+src/app/db/partitioning.py). Needs PostgreSQL 15+ for cross-partition
+updates of referenced rows, which happen whenever parsing replaces a bill's
+placeholder period. Unique keys of a partitioned table must contain the
+partition key, so:
+
+  - primary keys become (id, billing_period_start)
+  - user_appliances and insights get a billing_period_start column that a
+    trigger fills from the bill on insert
+  - every foreign key to bills becomes (bill_id, billing_period_start) with
+    ON UPDATE CASCADE, so a re-dated bill carries its children along
+  - bills.id (and appliance_estimates.id) is no longer unique on its own.
+    UUID defaults keep it unique in practice, but nothing enforces it, and
+    INSERT ... ON CONFLICT (id) fails for lack of a matching unique index;
+    BillRepository.upsert() refuses that target up front
+
+The rebuild copies every row while holding ACCESS EXCLUSIVE locks, so run it
+in a maintenance window. To opt in after this revision was applied without
+the flag, downgrade to 3c9e1b7d52a4 and upgrade again with the flag set.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.app.core.config import settings
+from src.app.db.partitioning import (
+    HISTORY_START_YEAR,
+    PARTITION_KEY,
+    create_default_partition_sql,
+    create_partition_sql,
+    partition_years,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d41c2e9a8f0"
+down_revision: Union[str, Sequence[str], None] = "3c9e1b7d52a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Non-partitioned tables that reference bills
+REFERENCING_TABLES = ("user_appliances", "insights")
+
+BILL_INDEXES = [
+    "CREATE INDEX ix_bills_id ON bills (id)",
+    "CREATE INDEX ix_bills_user_id ON bills (user_id)",
+    "CREATE INDEX ix_bills_user_id_billing_period_start"
+    " ON bills (user_id, billing_period_start, id)",
+    "CREATE INDEX ix_bills_user_id_created_at ON bills (user_id, created_at, id)",
+    "CREATE INDEX ix_bills_user_id_latest_success"
+    " ON bills (user_id, billing_period_end) WHERE parse_status = 'SUCCESS'",
+    "CREATE INDEX ix_bills_user_id_checksum"
+    " ON bills (user_id, checksum) WHERE checksum IS NOT NULL",
+    "CREATE INDEX ix_bills_provider_trgm ON bills USING gin (provider gin_trgm_ops)",
+]
+
+ESTIMATE_INDEXES = [
+    "CREATE INDEX ix_appliance_estimates_id ON appliance_estimates (id)",
+    "CREATE INDEX ix_appliance_estimates_bill_id ON appliance_estimates (bill_id)",
+    "CREATE INDEX ix_appliance_estimates_user_appliance_id"
+    " ON appliance_estimates (user_appliance_id)",
+]
+
+SET_BILL_PERIOD_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_bill_period_start() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    SELECT bills.billing_period_start INTO NEW.billing_period_start
+    FROM bills WHERE bills.id = NEW.bill_id;
+    RETURN NEW;
+END
+$$
+"""
+
+
+def _is_partitioned(table: str) -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:t)"),
+            {"t": table},
+        )
+        .scalar()
+    )
+
+
+def _rebuild(table: str, *, partitioned: bool, years=()) -> None:
+    """Recreate `table` (rows, defaults, NOT NULLs) with or without partitioning."""
+    new_table = f"{table}__rebuild"
+    partition_clause = f" PARTITION BY RANGE ({PARTITION_KEY})" if partitioned else ""
+    op.execute(
+        f"CREATE TABLE {new_table} "
+        f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_clause}"
+    )
+    if partitioned:
+        for year in years:
+            op.execute(create_partition_sql(table, year, parent=new_table))
+        op.execute(create_default_partition_sql(table, parent=new_table))
+
+    op.execute(f"INSERT INTO {new_table} SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+    primary_key = f"id, {PARTITION_KEY}" if partitioned else "id"
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})"
+    )
+
+
+def _add_bill_fk(table: str, *, composite: bool) -> None:
+    if composite:
+        op.create_foreign_key(
+            f"{table}_bill_id_fkey",
+            table,
+            "bills",
+            ["bill_id", PARTITION_KEY],
+            ["id", PARTITION_KEY],
+            onupdate="CASCADE",
+        )
+    else:
+        op.create_foreign_key(
+            f"{table}_bill_id_fkey", table, "bills", ["bill_id"], ["id"]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "appliance_estimates", sa.Column(PARTITION_KEY, sa.Date(), nullable=True)
+    )
+    op.execute(
+        """
+        UPDATE appliance_estimates
+        SET billing_period_start = bills.billing_period_start
+        FROM bills WHERE bills.id = appliance_estimates.bill_id
+        """
+    )
+
+    if not settings.BILL_PARTITIONING_ENABLED:
+        return
+
+    first_year = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT extract(year FROM min(billing_period_start))::int FROM bills"
+                " WHERE billing_period_start >= :floor"
+            ),
+            {"floor": date(HISTORY_START_YEAR, 1, 1)},
+        )
+        .scalar()
+    )
+    years = partition_years(first_year)
+
+    # 1. Children carry the bill's period so they can reference (id, period)
+    for table in REFERENCING_TABLES:
+        op.add_column(table, sa.Column(PARTITION_KEY, sa.Date(), nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table} SET billing_period_start = bills.billing_period_start
+            FROM bills WHERE bills.id = {table}.bill_id
+            """
+        )
+        op.alter_column(table, PARTITION_KEY, nullable=False)
+    op.alter_column("appliance_estimates", PARTITION_KEY, nullable=False)
+
+    for table in (*REFERENCING_TABLES, "appliance_estimates"):
+        op.drop_constraint(f"{table}_bill_id_fkey", table, type_="foreignkey")
+
+    # 2. bills
+    _rebuild("bills", partitioned=True, years=years)
+    op.create_foreign_key("bills_user_id_fkey", "bills", "users", ["user_id"], ["id"])
+    for statement in BILL_INDEXES:
+        op.execute(statement)
+
+    # 3. appliance_estimates, co-located on the same bounds
+    _rebuild("appliance_estimates", partitioned=True, years=years)
+    op.create_foreign_key(
+        "appliance_estimates_user_appliance_id_fkey",
+        "appliance_estimates",
+        "user_appliances",
+        ["user_appliance_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    for statement in ESTIMATE_INDEXES:
+        op.execute(statement)
+
+    # 4. Foreign keys to the partitioned bills
+    for table in (*REFERENCING_TABLES, "appliance_estimates"):
+        _add_bill_fk(table, composite=True)
+
+    op.execute(SET_BILL_PERIOD_FUNCTION)
+    for table in REFERENCING_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_set_bill_period_start
+            BEFORE INSERT OR UPDATE OF bill_id ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_bill_period_start()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_partitioned("bills"):
+        for table in REFERENCING_TABLES:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {table}_set_bill_period_start ON {table}"
+            )
+        op.execute("DROP FUNCTION IF EXISTS set_bill_period_start()")
+
+        for table in (*REFERENCING_TABLES, "appliance_estimates"):
+            op.drop_constraint(f"{table}_bill_id_fkey", table, type_="foreignkey")
+
+        _rebuild("appliance_estimates", partitioned=False)
+        op.create_foreign_key(
+            "appliance_estimates_user_appliance_id_fkey",
+            "appliance_estimates",
+            "user_appliances",
+            ["user_appliance_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+        for statement in ESTIMATE_INDEXES:
+            op.execute(statement)
+
+        _rebuild("bills", partitioned=False)
+        op.create_foreign_key(
+            "bills_user_id_fkey", "bills", "users", ["user_id"], ["id"]
+        )
+        for statement in BILL_INDEXES:
+            op.execute(statement)
+
+        for table in (*REFERENCING_TABLES, "appliance_estimates"):
+            _add_bill_fk(table, composite=False)
+        for table in REFERENCING_TABLES:
+            op.drop_column(table, PARTITION_KEY)
+
+    op.drop_column("appliance_estimates", PARTITION_KEY)
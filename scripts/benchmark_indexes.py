@@ -0,0 +1,312 @@
+# scripts/benchmark_indexes.py
+"""
+Seed a database with synthetic users/bills/appliances and record
+EXPLAIN (ANALYZE, BUFFERS) for the hot repository queries, with and without
+the indexes added in migration 3c9e1b7d52a4.
+
+The "before" plans are taken inside a transaction that drops those indexes
+and is then rolled back, so a single run against a database at head gives
+both sides of the comparison and leaves the schema untouched.
+
+Point it at a scratch database, never at production: seeding writes
+millions of rows and the before phase holds ACCESS EXCLUSIVE locks.
+
+    poetry run alembic upgrade head
+    poetry run python scripts/benchmark_indexes.py --users 100000 --bills-per-user 24
+    poetry run python scripts/benchmark_indexes.py --skip-seed --output plans.json
+    poetry run python scripts/benchmark_indexes.py --cleanup
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.app.core.config import settings  # noqa: E402
+
+BENCH_DOMAIN = "bench.greenspark.local"
+
+# Indexes created by migration 3c9e1b7d52a4
+NEW_INDEXES = [
+    "ix_bills_user_id_billing_period_start",
+    "ix_bills_user_id_created_at",
+    "ix_bills_user_id_latest_success",
+    "ix_bills_user_id_checksum",
+    "ix_bills_provider_trgm",
+    "ix_user_appliances_user_id_custom_name",
+    "ix_user_appliances_user_id_created_at",
+    "ix_users_email_trgm",
+    "ix_users_username_trgm",
+    "ix_users_first_name_trgm",
+]
+
+# ================== SEED ==================
+SEED_USERS = text(
+    f"""
+    INSERT INTO users (email, first_name, last_name, username, timezone,
+                       is_active, is_verified, hashed_password)
+    SELECT 'bench' || g || '@{BENCH_DOMAIN}', 'Bench' || g, 'User',
+           'bench_' || g, 'Asia/Kolkata', true, true, 'not-a-real-hash'
+    FROM generate_series(1, :users) AS g
+    """
+)
+
+# ~0.1% of bills get a rare provider so the trigram search has a selective term
+SEED_BILLS = text(
+    f"""
+    INSERT INTO bills (user_id, billing_period_start, billing_period_end,
+                       kwh_total, cost_total, provider, parse_status,
+                       source_type, checksum, created_at)
+    SELECT u.id,
+           DATE '2018-01-01' + g * 30,
+           DATE '2018-01-01' + g * 30 + 29,
+           round((100 + random() * 400)::numeric, 2),
+           round((800 + random() * 3200)::numeric, 2),
+           CASE WHEN random() < 0.001 THEN 'Kerala State Electricity Board'
+                ELSE (ARRAY['Tata Power', 'Adani Electricity', 'BSES Rajdhani',
+                            'MSEDCL', 'BESCOM'])[1 + g % 5]
+           END,
+           (CASE WHEN random() < 0.9 THEN 'SUCCESS' ELSE 'FAILED' END)::billstatus,
+           'PDF'::billsource,
+           md5(u.id::text || g),
+           now() - make_interval(days => (:bills_per_user - g) * 30)
+    FROM users AS u
+    CROSS JOIN generate_series(1, :bills_per_user) AS g
+    WHERE u.email LIKE '%@{BENCH_DOMAIN}'
+    """
+)
+
+SEED_APPLIANCES = text(
+    f"""
+    INSERT INTO user_appliances (custom_name, count, hours_per_day,
+                                 days_per_week, user_id, bill_id)
+    SELECT 'Appliance ' || g, 1, 1 + random() * 10, 7, b.user_id, b.id
+    FROM (
+        SELECT DISTINCT ON (bills.user_id) bills.user_id, bills.id
+        FROM bills
+        JOIN users ON users.id = bills.user_id
+        WHERE users.email LIKE '%@{BENCH_DOMAIN}'
+        ORDER BY bills.user_id, bills.created_at DESC
+    ) AS b
+    CROSS JOIN generate_series(1, :appliances_per_user) AS g
+    """
+)
+
+CLEANUP = [
+    text(
+        f"""
+        DELETE FROM appliance_estimates WHERE bill_id IN (
+            SELECT bills.id FROM bills JOIN users ON users.id = bills.user_id
+            WHERE users.email LIKE '%@{BENCH_DOMAIN}')
+        """
+    ),
+    text(
+        f"""
+        DELETE FROM user_appliances WHERE user_id IN (
+            SELECT id FROM users WHERE email LIKE '%@{BENCH_DOMAIN}')
+        """
+    ),
+    text(
+        f"""
+        DELETE FROM bills WHERE user_id IN (
+            SELECT id FROM users WHERE email LIKE '%@{BENCH_DOMAIN}')
+        """
+    ),
+    text(f"DELETE FROM users WHERE email LIKE '%@{BENCH_DOMAIN}'"),
+]
+
+# ================== QUERIES ==================
+# Mirrors of the statements the repositories emit, with :user_id etc. bound
+QUERIES: Dict[str, str] = {
+    "bills_by_period": """
+        SELECT * FROM bills WHERE user_id = :user_id
+        ORDER BY billing_period_start DESC, id DESC LIMIT 21
+    """,
+    "bills_by_created_at": """
+        SELECT * FROM bills WHERE user_id = :user_id
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "bills_keyset_page": """
+        SELECT * FROM bills
+        WHERE user_id = :user_id
+          AND (created_at, id) < (now() - interval '1 year',
+                                  'ffffffff-ffff-ffff-ffff-ffffffffffff'::uuid)
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "latest_successful_bill": """
+        SELECT * FROM bills
+        WHERE user_id = :user_id AND parse_status = 'SUCCESS'
+        ORDER BY billing_period_end DESC LIMIT 1
+    """,
+    "bill_by_checksum": """
+        SELECT * FROM bills WHERE checksum = :checksum AND user_id = :user_id
+    """,
+    "appliance_by_name": """
+        SELECT * FROM user_appliances
+        WHERE custom_name = 'Appliance 3' AND user_id = :user_id
+    """,
+    "appliances_by_user": """
+        SELECT * FROM user_appliances WHERE user_id = :user_id
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "bill_provider_search": """
+        SELECT * FROM bills WHERE provider ILIKE '%kerala%'
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "user_search": """
+        SELECT * FROM users
+        WHERE email ILIKE :term OR username ILIKE :term OR first_name ILIKE :term
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+}
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def seed(conn: Connection, users: int, bills_per_user: int, appliances: int) -> None:
+    for label, statement, params in (
+        ("users", SEED_USERS, {"users": users}),
+        ("bills", SEED_BILLS, {"bills_per_user": bills_per_user}),
+        ("user_appliances", SEED_APPLIANCES, {"appliances_per_user": appliances}),
+    ):
+        started = time.perf_counter()
+        rowcount = conn.execute(statement, params).rowcount
+        _log(f"seeded {rowcount} {label} in {time.perf_counter() - started:.1f}s")
+
+
+def _sample_params(conn: Connection) -> Dict[str, Any]:
+    """Pick a bench user from the middle of the range and one of its bills."""
+    row = conn.execute(
+        text(
+            f"""
+            WITH bench_user AS (
+                SELECT id, username FROM users
+                WHERE email LIKE '%@{BENCH_DOMAIN}'
+                ORDER BY id
+                OFFSET (SELECT count(*) / 2 FROM users
+                        WHERE email LIKE '%@{BENCH_DOMAIN}')
+                LIMIT 1
+            )
+            SELECT u.id, u.username, b.checksum
+            FROM bench_user u JOIN bills b ON b.user_id = u.id
+            LIMIT 1
+            """
+        )
+    ).one_or_none()
+    if row is None:
+        raise SystemExit("No benchmark rows found; run without --skip-seed first.")
+    return {"user_id": row.id, "checksum": row.checksum, "term": f"%{row.username}%"}
+
+
+def _index_names(node: Dict[str, Any]) -> List[str]:
+    names = [node["Index Name"]] if "Index Name" in node else []
+    for child in node.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def _explain(conn: Connection, sql: str, params: Dict, repeat: int) -> Dict:
+    statement = text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+    runs = []
+    for _ in range(repeat + 1):  # first run only warms the cache
+        runs.append(conn.execute(statement, params).scalar_one()[0])
+    runs = runs[1:]
+    plan = runs[-1]
+    return {
+        "execution_ms": statistics.median(run["Execution Time"] for run in runs),
+        "planning_ms": statistics.median(run["Planning Time"] for run in runs),
+        "root_node": plan["Plan"]["Node Type"],
+        "indexes": sorted(set(_index_names(plan["Plan"]))),
+        "plan": plan,
+    }
+
+
+def run_queries(conn: Connection, params: Dict, repeat: int) -> Dict[str, Dict]:
+    return {
+        name: _explain(conn, sql, params, repeat) for name, sql in QUERIES.items()
+    }
+
+
+def benchmark(engine, repeat: int) -> Dict[str, Dict[str, Dict]]:
+    with engine.connect() as conn:
+        params = _sample_params(conn)
+
+        # Before: the new indexes dropped inside a transaction we roll back
+        trans = conn.begin()
+        try:
+            for name in NEW_INDEXES:
+                conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+            before = run_queries(conn, params, repeat)
+        finally:
+            trans.rollback()
+
+        with conn.begin():
+            after = run_queries(conn, params, repeat)
+
+    return {"before": before, "after": after}
+
+
+def print_report(results: Dict[str, Dict[str, Dict]]) -> None:
+    header = f"{'query':<24} {'before ms':>10} {'after ms':>10} {'speedup':>8}  after plan"
+    print(header)
+    print("-" * len(header))
+    for name in QUERIES:
+        before = results["before"][name]
+        after = results["after"][name]
+        speedup = before["execution_ms"] / max(after["execution_ms"], 0.001)
+        plan = ", ".join(after["indexes"]) or after["root_node"]
+        print(
+            f"{name:<24} {before['execution_ms']:>10.2f} "
+            f"{after['execution_ms']:>10.2f} {speedup:>7.1f}x  {plan}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL_SYNC)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--bills-per-user", type=int, default=24)
+    parser.add_argument("--appliances-per-user", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true", help="delete bench rows")
+    parser.add_argument("--output", help="write full JSON plans to this file")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+
+    if args.cleanup:
+        with engine.begin() as conn:
+            for statement in CLEANUP:
+                conn.execute(statement)
+        _log("benchmark rows deleted")
+        return
+
+    if not args.skip_seed:
+        with engine.begin() as conn:
+            seed(conn, args.users, args.bills_per_user, args.appliances_per_user)
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(text("ANALYZE users, bills, user_appliances"))
+
+    results = benchmark(engine, args.repeat)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2, default=str)
+        _log(f"plans written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
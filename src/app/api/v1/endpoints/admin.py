@@ -1,8 +1,8 @@
 import logging
 import uuid
-from typing import Dict
+from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.app.core.config import settings
@@ -27,6 +27,7 @@ from src.app.schemas.user_schema import (
 )
 from src.app.models.user_model import User, UserRole
 from src.app.services.user_service import user_service
+from src.app.services.cache_service import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -52,9 +53,11 @@ async def get_user_by_id(
 ):
     """Get User's profile by it's ID (Admin only)"""
 
-    return await user_service.get_user_by_id(
+    # Served straight from the cached JSON; response_model is documentation only.
+    payload = await user_service.get_user_json_by_id(
         db=db, user_id=user_id, current_user=current_user
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -216,12 +219,33 @@ async def get_all_users(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
     )
 
 
+@router.get(
+    "/metrics/cache",
+    response_model=Dict[str, Dict[str, Any]],
+    status_code=status.HTTP_200_OK,
+    summary="Cache metrics",
+    description="Per-schema cache counters for the worker serving the request (Admins only).",
+    dependencies=[
+        Depends(require_admin),
+        Depends(rate_limit_api),
+    ],
+)
+async def get_cache_metrics(
+    *,
+    current_user: User = Depends(get_current_verified_user),
+    reset: bool = Query(False, description="Reset the counters after reading"),
+):
+    """Hits, misses, loader latency, payload sizes and Redis errors per cached schema"""
+    return cache_service.metrics_snapshot(reset=reset)
+
+
 # ============Appliances and Catalogs===========
 @router.get(
     "/{user_id}/appliances",
@@ -251,6 +275,7 @@ async def get_all_appliances_by_user(
         order_desc=order_desc,
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor,
     )
 
 
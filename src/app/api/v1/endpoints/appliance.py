@@ -1,7 +1,7 @@
 import logging
 import uuid
 from typing import Dict, List
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.app.core.config import settings
@@ -69,9 +69,11 @@ async def get_appliance_by_id(
 ):
     """Get appliance by it's ID"""
 
-    return await appliance_service.get_appliance_by_id(
+    # Served straight from the cached JSON; response_model is documentation only.
+    payload = await appliance_service.get_appliance_json_by_id(
         db=db, appliance_id=appliance_id, current_user=current_user
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get(
@@ -103,6 +105,7 @@ async def get_all_appliances(
         order_desc=order_desc,
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor,
     )
 
 
@@ -1,7 +1,7 @@
 import logging
 import uuid
 from typing import Dict
-from fastapi import APIRouter, Depends, status, Query, File, UploadFile
+from fastapi import APIRouter, Depends, status, Query, File, UploadFile, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.app.db.session import get_session
@@ -64,6 +64,7 @@ async def get_all_bills(
         skip=pagination.skip,
         user_id=current_user.id,
         limit=pagination.limit,
+        cursor=pagination.cursor,
         order_by=order_by,
         order_desc=order_desc,
         filters=search_params.model_dump(exclude_none=True),
@@ -86,11 +87,13 @@ async def get_bill_by_id(
 ):
     """Get Bill by it's ID"""
 
-    return await bill_service.get_bill_by_id(
+    # Served straight from the cached JSON; response_model is documentation only.
+    payload = await bill_service.get_bill_json_by_id(
         db=db,
         current_user=current_user,
         bill_id=bill_id,
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.delete(
@@ -148,6 +148,7 @@ async def get_my_bills(
         user_id=current_user.id,
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor,
         order_by=order_by,
         order_desc=order_desc,
         filters=search_params.model_dump(exclude_none=True),
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from src.app.core.config import settings
 from src.app.models import Bill, User
 
@@ -21,6 +22,16 @@ celery_app.conf.update(
     enable_utc=True,
 )
 
+# Async execution mode (opt-in): every pool thread just waits on a coroutine running on
+# the process's shared event loop (see tasks/runtime.py), so one worker
+# process keeps many I/O-bound jobs in flight.
+if settings.CELERY_EXECUTION_MODE == "async":
+    celery_app.conf.update(
+        worker_pool="threads",
+        worker_concurrency=settings.CELERY_ASYNC_CONCURRENCY,
+        worker_prefetch_multiplier=1,
+    )
+
 # Auto-discover task modules. Celery will look for a tasks.py file
 # in all the apps listed here.
 # celery_app.autodiscover_tasks(["src.app.tasks.email_tasks"])
@@ -28,5 +39,14 @@ celery_app.conf.imports = [
     "src.app.tasks.email_tasks",
     "src.app.tasks.parsing_tasks",
     "src.app.tasks.estimation_tasks",
-    "src.app.tasks.insights_task"
+    "src.app.tasks.insights_task",
+    "src.app.tasks.maintenance_tasks",
 ]
+
+# Periodic jobs, run by the `beat` service in docker-compose.yml
+celery_app.conf.beat_schedule = {
+    "maintain-bill-partitions": {
+        "task": "tasks.maintain_bill_partitions",
+        "schedule": crontab(hour=3, minute=15),
+    },
+}
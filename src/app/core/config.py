@@ -1,4 +1,6 @@
 # app/core/config.py
+from typing import Dict
+
 from pydantic import PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -30,6 +32,52 @@ class Settings(BaseSettings):
 
     REDIS_URL: str
 
+    # --- Cache Settings ---
+    # In-process L1 tier that sits in front of Redis. Entries are only served
+    # while the process is subscribed to the invalidation channel.
+    CACHE_LOCAL_ENABLED: bool = True
+    CACHE_LOCAL_MAX_ENTRIES: int = 10_000
+    CACHE_LOCAL_MAX_BYTES: int = 32 * 1024 * 1024  # 32MB
+    CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    # Per-schema L1 TTLs keyed by lowercased schema name, e.g. {"user": 10}
+    CACHE_LOCAL_TTL_OVERRIDES: Dict[str, float] = {}
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    # Storage codec: "json", "zstd", "lz4" or "msgpack". zstd/lz4/msgpack need
+    # the zstandard/lz4/msgpack packages. Overrides are keyed by lowercased
+    # schema name, e.g. {"billdetailedresponse": "zstd"}
+    CACHE_CODEC: str = "json"
+    CACHE_CODEC_OVERRIDES: Dict[str, str] = {}
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    # Lifetime of "not found" tombstones; 0 disables negative caching
+    CACHE_NEGATIVE_TTL_SECONDS: int = 30
+
+    # --- Rate Limiting ---
+    # In-process token buckets: the limiter when Redis is unavailable, and a
+    # pre-filter in front of Redis that rejects identifiers this process has
+    # already seen exhaust their quota.
+    RATE_LIMIT_LOCAL_PREFILTER: bool = True
+    RATE_LIMIT_LOCAL_MAX_ENTRIES: int = 100_000
+    # Quota leasing: each worker takes up to this many tokens per Redis call
+    # and spends them locally (capped at a quarter of the limit; <= 1 disables).
+    # Unspent tokens are given up after RATE_LIMIT_LEASE_TTL_SECONDS.
+    RATE_LIMIT_LEASE_SIZE: int = 0
+    RATE_LIMIT_LEASE_TTL_SECONDS: float = 5.0
+
+    # --- Bill Partitioning ---
+    # Read by migration 7d41c2e9a8f0: when true, bills and appliance_estimates
+    # are rebuilt as tables range-partitioned by billing_period_start (yearly)
+    BILL_PARTITIONING_ENABLED: bool = False
+    # Future years that always have partitions (kept up by a beat task)
+    BILL_PARTITION_YEARS_AHEAD: int = 2
+
+    # --- Background Workers ---
+    # "prefork" (default) keeps Celery's one task per child process.
+    # "async" is opt-in: task coroutines share one event loop per worker
+    # process (threads pool), with up to CELERY_ASYNC_CONCURRENCY jobs in
+    # flight (never more than DB_POOL_SIZE + DB_MAX_OVERFLOW).
+    CELERY_EXECUTION_MODE: str = "prefork"
+    CELERY_ASYNC_CONCURRENCY: int = 32
+
     FRONTEND_URL: str = "http://localhost:5173"
 
     @computed_field
@@ -60,6 +108,19 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     JWT_ALGORITHM: str = "HS256"
+    # Dedicated threads for Argon2, and how many more operations may wait
+    # for them before new ones are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    # Local Bloom filter of revoked JTIs; Redis is only asked on a filter hit
+    REVOCATION_FILTER_ENABLED: bool = True
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_REFRESH_SECONDS: float = 300
+    # "jose" (python-jose) or "pyjwt" (needs the PyJWT package)
+    JWT_BACKEND: str = "jose"
+    # Verified tokens kept in-process until their exp; 0 disables the cache
+    JWT_DECODE_CACHE_SIZE: int = 10_000
 
     # --- Email Settings ---
     MAIL_FROM_NAME: str 
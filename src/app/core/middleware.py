@@ -229,6 +229,10 @@ class ProfessionalLoggingMiddleware:
                 status_code = int(message["status"])
                 headers = MutableHeaders(raw=message.setdefault("headers", []))
                 headers[self.request_id_header] = request_id
+                rate_limit = scope["state"].get("rate_limit")
+                if rate_limit is not None:
+                    for k, v in rate_limit.headers().items():
+                        headers[k] = v
             elif message["type"] == "http.response.body":
                 body = message.get("body", b"") or b""
                 response_bytes += len(body)
@@ -415,7 +419,14 @@ def register_middlewares(app: FastAPI) -> None:
 
     cors_methods = ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"]
     cors_headers = ["*"]
-    expose_headers = ["X-Request-ID", "Retry-After", "Content-Disposition"]
+    expose_headers = [
+        "X-Request-ID",
+        "Retry-After",
+        "Content-Disposition",
+        "X-RateLimit-Limit",
+        "X-RateLimit-Remaining",
+        "X-RateLimit-Reset",
+    ]
 
     app.add_middleware(
         CORSMiddleware,
@@ -1,17 +1,31 @@
+import asyncio
+import hashlib
 import logging
+import math
 import secrets
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+# Optional faster JWT implementation (JWT_BACKEND="pyjwt").
+try:
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover
+    pyjwt = None
+
 from src.app.core.config import settings
 from src.app.core.exceptions import (
     InternalServerError,
     InvalidToken,
+    ServiceUnavailable,
     TokenExpired,
     TokenRevoked,
     TokenTypeInvalid,
@@ -22,6 +36,8 @@ from src.app.db.redis_conn import redis_client
 # --- Setup ---
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 # ---- Enums & Config ----
 class TokenType(str, Enum):
@@ -63,6 +79,23 @@ class SecurityConfig:
     JWT_LEEWAY_SECONDS: int = int(
         getattr(settings, "JWT_LEEWAY_SECONDS", 10)
     )  # clock skew leeway
+    PASSWORD_HASH_WORKERS: int = int(getattr(settings, "PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_QUEUE: int = int(getattr(settings, "PASSWORD_HASH_MAX_QUEUE", 32))
+    REVOCATION_FILTER_ENABLED: bool = bool(
+        getattr(settings, "REVOCATION_FILTER_ENABLED", True)
+    )
+    REVOCATION_FILTER_CAPACITY: int = int(
+        getattr(settings, "REVOCATION_FILTER_CAPACITY", 100_000)
+    )
+    REVOCATION_FILTER_ERROR_RATE: float = float(
+        getattr(settings, "REVOCATION_FILTER_ERROR_RATE", 0.001)
+    )
+    REVOCATION_FILTER_REFRESH_SECONDS: float = float(
+        getattr(settings, "REVOCATION_FILTER_REFRESH_SECONDS", 300)
+    )
+    REVOCATION_CHANNEL: str = getattr(settings, "REVOCATION_CHANNEL", "revoked_tokens")
+    JWT_BACKEND: str = getattr(settings, "JWT_BACKEND", "jose")
+    JWT_DECODE_CACHE_SIZE: int = int(getattr(settings, "JWT_DECODE_CACHE_SIZE", 10_000))
 
     @classmethod
     def validate(cls) -> None:
@@ -76,9 +109,63 @@ SecurityConfig.validate()
 
 
 # ---- Password Management ----
+class PasswordHashPool:
+    """
+    Small dedicated thread pool for password hashing, so Argon2 (~50MB and
+    tens of ms per call) never runs on the event loop. argon2-cffi releases
+    the GIL, so the workers hash in parallel with request handling.
+
+    At most max_workers + max_queue operations are accepted at a time;
+    beyond that callers get a 503 right away instead of piling up behind a
+    login storm (and multiplying Argon2's memory use).
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max(1, int(max_workers))
+        self._slots = threading.BoundedSemaphore(self.max_workers + max(0, max_queue))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-hash"
+                    )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            logger.warning("Password hashing queue is full; rejecting request.")
+            raise ServiceUnavailable(
+                detail="Too many password operations in progress. Please try again shortly.",
+                service="password_hashing",
+                retry_after=1,
+            )
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released when the work really finishes, even if the caller is
+        # cancelled meanwhile, so the bound reflects busy threads.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
 class PasswordManager:
     """Encapsulates all password hashing and verification logic (Argon2 preferred)."""
 
+    pool = PasswordHashPool(
+        SecurityConfig.PASSWORD_HASH_WORKERS, SecurityConfig.PASSWORD_HASH_MAX_QUEUE
+    )
+
     pwd_context = CryptContext(
         schemes=["argon2", "bcrypt"],
         deprecated="auto",
@@ -107,6 +194,18 @@ class PasswordManager:
             )
             return False
 
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """hash_password on the password hashing pool."""
+        return await cls.pool.run(cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        """verify_password on the password hashing pool."""
+        return await cls.pool.run(cls.verify_password, plain_password, hashed_password)
+
     @classmethod
     def needs_rehash(cls, hashed_password: str) -> bool:
         """Check if a hash needs to be updated to the latest parameters."""
@@ -127,12 +226,299 @@ class PasswordManager:
         return False, hashed_password
 
 
+# ---- JWT Backends ----
+class JoseBackend:
+    """python-jose (the default)."""
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(
+        self,
+        token: str,
+        key: str,
+        *,
+        algorithms: List[str],
+        audience: Union[str, List[str]],
+        issuer: str,
+        leeway: int,
+    ) -> Dict[str, Any]:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=algorithms,
+            audience=audience,
+            issuer=issuer,
+            options={"leeway": leeway},
+        )
+
+
+class PyJWTBackend(JoseBackend):
+    """
+    PyJWT, noticeably cheaper per decode than python-jose. Errors are
+    re-raised as python-jose exceptions so callers handle one family.
+    """
+
+    def __init__(self):
+        if pyjwt is None:
+            raise RuntimeError("The pyjwt JWT backend requires the 'PyJWT' package.")
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return pyjwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(
+        self,
+        token: str,
+        key: str,
+        *,
+        algorithms: List[str],
+        audience: Union[str, List[str]],
+        issuer: str,
+        leeway: int,
+    ) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(
+                token,
+                key,
+                algorithms=algorithms,
+                audience=audience,
+                issuer=issuer,
+                leeway=leeway,
+            )
+        except pyjwt.ExpiredSignatureError as e:
+            raise jwt.ExpiredSignatureError(str(e)) from e
+        except pyjwt.InvalidTokenError as e:
+            raise JWTError(str(e)) from e
+
+
+_JWT_BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+
+def build_jwt_backend(name: str) -> JoseBackend:
+    """Build a JWT backend from its config name ("jose", "pyjwt")."""
+    try:
+        return _JWT_BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {name!r}") from None
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified JWT claims, keyed by the token's SHA-256
+    digest (the token itself is never kept). Entries expire at the token's
+    own exp, so a cached token can never outlive its validity. Only the
+    signature/claims check is skipped on a hit; type, revocation and
+    tokens_valid_from checks still run on every request.
+    """
+
+    __slots__ = ("max_entries", "_data")
+
+    def __init__(self, max_entries: int):
+        self.max_entries = int(max_entries)
+        # digest -> (exp, claims)
+        self._data: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(digest)
+        if entry is None:
+            return None
+        exp, claims = entry
+        if exp <= time.time():
+            del self._data[digest]
+            return None
+        self._data.move_to_end(digest)
+        # Callers may mutate what they get back
+        return dict(claims)
+
+    def set(self, digest: bytes, claims: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        self._data[digest] = (float(exp), dict(claims))
+        self._data.move_to_end(digest)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# ---- Revocation filter ----
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no deletes, no false negatives)."""
+
+    __slots__ = ("size", "hashes", "count", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, int(capacity))
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationFilter:
+    """
+    Local Bloom filter of revoked JTIs, so the Redis blacklist is only
+    consulted for tokens that might be revoked.
+
+    revoke_token/revoke_by_jti publish every JTI on REVOCATION_CHANNEL.
+    Once started, the filter subscribes to that channel first and then loads
+    the existing revoked_token:* keys, so nothing slips through in between.
+    It is rebuilt every refresh interval to shed expired revocations
+    (Bloom filters cannot delete). It is only trusted while the subscription
+    is up; before start() and after a disconnect every check goes to Redis.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        key_prefix: str,
+        capacity: int,
+        error_rate: float,
+        refresh_interval: float,
+    ):
+        self.channel = channel
+        self.key_prefix = key_prefix
+        self.capacity = int(capacity)
+        self.error_rate = float(error_rate)
+        self.refresh_interval = float(refresh_interval)
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        # JTIs announced while a rebuild is scanning Redis
+        self._pending: Optional[List[str]] = None
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def might_contain(self, jti: str) -> bool:
+        """False only when jti is known not to be revoked."""
+        return not self._ready or jti in self._filter
+
+    def add(self, jti: str) -> None:
+        self._filter.add(jti)
+        if self._pending is not None:
+            self._pending.append(jti)
+
+    async def _rebuild(self) -> None:
+        self._pending = []
+        try:
+            jtis: List[str] = []
+            async for key in redis_client.scan_iter(
+                match=f"{self.key_prefix}*", count=1000
+            ):
+                jtis.append(key[len(self.key_prefix) :])
+            rebuilt = BloomFilter(
+                max(self.capacity, 2 * (len(jtis) + len(self._pending))),
+                self.error_rate,
+            )
+            for jti in jtis:
+                rebuilt.add(jti)
+            for jti in self._pending:
+                rebuilt.add(jti)
+            self._filter = rebuilt
+        finally:
+            self._pending = None
+
+    async def start(self) -> None:
+        if self._task is None and redis_client is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        self._ready = False
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            refresher: Optional[asyncio.Task] = None
+            try:
+                await pubsub.subscribe(self.channel)
+                await self._rebuild()
+                self._ready = True
+                refresher = asyncio.create_task(self._refresh_periodically())
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.add(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Revocation filter listener disconnected; retrying.", exc_info=True
+                )
+            finally:
+                self._ready = False
+                if refresher is not None:
+                    refresher.cancel()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(1.0)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self._rebuild()
+            except Exception:
+                # Keep the current (superset) filter until the next attempt.
+                logger.warning("Revocation filter rebuild failed.", exc_info=True)
+
+
 # ---- Token Management ----
 class TokenManager:
     """Low-level token operations - creation, verification, revocation/blacklist."""
 
     config = SecurityConfig
 
+    def __init__(self):
+        self.backend = build_jwt_backend(self.config.JWT_BACKEND)
+        self.verified_cache = VerifiedTokenCache(self.config.JWT_DECODE_CACHE_SIZE)
+        self.revocation_filter: Optional[RevocationFilter] = (
+            RevocationFilter(
+                channel=self.config.REVOCATION_CHANNEL,
+                key_prefix=self.revoked_token_key(""),
+                capacity=self.config.REVOCATION_FILTER_CAPACITY,
+                error_rate=self.config.REVOCATION_FILTER_ERROR_RATE,
+                refresh_interval=self.config.REVOCATION_FILTER_REFRESH_SECONDS,
+            )
+            if self.config.REVOCATION_FILTER_ENABLED
+            else None
+        )
+
     @staticmethod
     def _now_utc() -> datetime:
         return datetime.now(timezone.utc)
@@ -173,7 +559,7 @@ class TokenManager:
         if additional_claims:
             claims.update(additional_claims)
 
-        return jwt.encode(
+        return self.backend.encode(
             claims, self.config.JWT_SECRET_KEY, algorithm=self.config.JWT_ALGORITHM
         )
 
@@ -193,21 +579,29 @@ class TokenManager:
         }
 
     async def verify_token(
-        self, token: str, expected_type: TokenType
+        self, token: str, expected_type: TokenType, check_revocation: bool = True
     ) -> Dict[str, Any]:
-        """Verify and decode a JWT; validate iss/aud/exp/nbf; check type and blacklist."""
+        """
+        Verify and decode a JWT; validate iss/aud/exp/nbf; check type and blacklist.
+        With check_revocation=False the caller is responsible for looking up
+        revoked_token_key(jti) (e.g. batched with other Redis reads).
+        """
         if not token:
             raise InvalidToken("Token cannot be empty.")
 
         try:
-            payload = jwt.decode(
-                token,
-                self.config.JWT_SECRET_KEY,
-                algorithms=[self.config.JWT_ALGORITHM],
-                audience=self.config.TOKEN_AUDIENCE,
-                issuer=self.config.TOKEN_ISSUER,
-                options={"leeway": self.config.JWT_LEEWAY_SECONDS},
-            )
+            digest = self.verified_cache.digest(token)
+            payload = self.verified_cache.get(digest)
+            if payload is None:
+                payload = self.backend.decode(
+                    token,
+                    self.config.JWT_SECRET_KEY,
+                    algorithms=[self.config.JWT_ALGORITHM],
+                    audience=self.config.TOKEN_AUDIENCE,
+                    issuer=self.config.TOKEN_ISSUER,
+                    leeway=self.config.JWT_LEEWAY_SECONDS,
+                )
+                self.verified_cache.set(digest, payload)
 
             token_type = payload.get("type")
             if token_type != expected_type.value:
@@ -221,7 +615,7 @@ class TokenManager:
                 jti = payload.get("jti")
                 if not jti:
                     raise InvalidToken("Token is missing the required 'jti' claim.")
-                if await self.is_token_revoked(jti):
+                if check_revocation and await self.is_token_revoked(jti):
                     raise TokenRevoked()
 
             return payload
@@ -240,6 +634,28 @@ class TokenManager:
             raise InvalidToken("Token is invalid or malformed.") from e
 
     # ---- Blacklist operations ----
+    @staticmethod
+    def revoked_token_key(jti: str) -> str:
+        return f"revoked_token:{jti}"
+
+    def may_be_revoked(self, jti: str) -> bool:
+        """
+        Cheap local pre-check: False means the revocation filter knows jti is
+        not revoked, so the Redis lookup can be skipped.
+        """
+        if self.revocation_filter is None:
+            return True
+        return self.revocation_filter.might_contain(jti)
+
+    async def _store_revocation(self, jti: str, reason: str, ttl: int) -> None:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(self.revoked_token_key(jti), reason, ex=ttl)
+            pipe.publish(self.config.REVOCATION_CHANNEL, jti)
+            await pipe.execute()
+        if self.revocation_filter is not None:
+            # Effective here right away, without waiting for our own message
+            self.revocation_filter.add(jti)
+
     async def revoke_token(self, token: str, reason: str = "Revoked") -> bool:
         """Revoke a token by extracting its JTI and calculating TTL in Redis."""
         if not self.config.ENABLE_TOKEN_BLACKLIST:
@@ -274,8 +690,7 @@ class TokenManager:
             if remaining_time <= 0:
                 return True  # Already expired
 
-            key = f"revoked_token:{jti}"
-            await redis_client.set(key, reason, ex=remaining_time)
+            await self._store_revocation(jti, reason, remaining_time)
             logger.info(f"Token revoked: {jti}")
             return True
         except Exception:
@@ -298,8 +713,7 @@ class TokenManager:
             remaining_time = exp_ts - self._ts(self._now_utc())
             if remaining_time <= 0:
                 return True
-            key = f"revoked_token:{jti}"
-            await redis_client.set(key, reason, ex=remaining_time)
+            await self._store_revocation(jti, reason, remaining_time)
             return True
         except Exception:
             logger.error("Failed to revoke token by JTI.", exc_info=True)
@@ -318,8 +732,11 @@ class TokenManager:
                 raise InternalServerError(msg)
             return False
 
+        if not self.may_be_revoked(jti):
+            return False
+
         try:
-            key = f"revoked_token:{jti}"
+            key = self.revoked_token_key(jti)
             exists = await redis_client.exists(key)
             return bool(exists)
         except Exception:
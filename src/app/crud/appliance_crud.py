@@ -1,14 +1,14 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
-from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, and_, delete
+from sqlmodel import select, and_, delete
 
 from src.app.core.exception_utils import handle_exceptions
 from src.app.core.exceptions import InternalServerError
+from src.app.crud.base import BaseRepository
+from src.app.crud.pagination import Page, paginate
 
 from src.app.models.appliance_model import (
     ApplianceCatalog,
@@ -18,36 +18,6 @@ from src.app.models.appliance_model import (
 
 logger = logging.getLogger(__name__)
 
-T = TypeVar("T")
-
-
-class BaseRepository(ABC, Generic[T]):
-    """Abstract base repository providing consistent interface for database operations."""
-
-    def __init__(self, model: type[T]):
-        self.model = model
-
-    @abstractmethod
-    async def get(self, db: AsyncSession, *, obj_id: Any) -> Optional[T]:
-        """Get entity by its primary key."""
-        pass
-
-    @abstractmethod
-    async def create(self, db: AsyncSession, *, obj_in: Any) -> T:
-        """Create a new entity."""
-        pass
-
-    @abstractmethod
-    async def update(self, db: AsyncSession, *, db_obj: T, obj_in: Any) -> T:
-        """Update an existing entity."""
-        pass
-
-    @abstractmethod
-    async def delete(self, db: AsyncSession, *, obj_id: Any) -> None:
-        """Delete an entity by its primary key."""
-        pass
-
-
 class UserApplianceRepository(BaseRepository[UserAppliance]):
     """Repository for all database operations related to the User model."""
 
@@ -55,6 +25,9 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         super().__init__(UserAppliance)
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    def _load_options(self):
+        return [selectinload(self.model.estimates)]
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
@@ -66,7 +39,7 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         statement = (
             select(self.model)
             .where(self.model.id == obj_id)
-            .options(selectinload(self.model.estimates))
+            .options(*self._load_options())
         )
         result = await db.execute(statement)
         return result.scalar_one_or_none()
@@ -82,9 +55,10 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[UserAppliance], int]:
+    ) -> Page:
         """Get paginated list of user_appliancess by user_id"""
         query = (
             select(self.model)
@@ -92,19 +66,45 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
             .options(selectinload(self.model.estimates))
         )
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        appliances = result.scalars().all()
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
-        return appliances, total
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_ids_by_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+    ) -> Page:
+        """Get one page of a user's appliance IDs (no relationships loaded)."""
+        query = select(self.model.id).where(self.model.user_id == user_id)
+
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -117,9 +117,10 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         bill_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[UserAppliance], int]:
+    ) -> Page:
         """Get paginated list of user_appliancess by user_id"""
         query = (
             select(self.model)
@@ -127,19 +128,16 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
             .options(selectinload(self.model.estimates))  # 👈 force load estimates
         )
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        appliances = result.scalars().all()
-
-        return appliances, total
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -151,10 +149,11 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[UserAppliance], int]:
+    ) -> Page:
         """Get multiple user_appliancess with filtering and pagination."""
         query = select(self.model)
 
@@ -162,19 +161,16 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        appliances = result.scalars().all()
-
-        return appliances, total
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -183,7 +179,7 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
     async def create(self, db: AsyncSession, *, obj_in: UserAppliance) -> UserAppliance:
         """Create a new user_appliance. Expects a pre-constructed UserAppliance model object."""
         db.add(obj_in)
-        await db.commit()
+        await db.flush()
         await db.refresh(obj_in)
         self._logger.info(f"UserAppliance created: {obj_in.id}")
         return obj_in
@@ -201,17 +197,10 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
     ) -> UserAppliance:
         # Updates specific fields of a bill object.
 
-        for field, value in fields_to_update.items():
-            if field in {"created_at", "updated_at"} and isinstance(value, str):
-                try:
-                    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    value = datetime.now(timezone.utc)
-
-            setattr(appliance, field, value)
+        self._set_fields(appliance, fields_to_update)
 
         db.add(appliance)
-        await db.commit()
+        await db.flush()
         await db.refresh(appliance)
 
         self._logger.info(
@@ -227,7 +216,6 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         """Delete a user_appliance by it's ID"""
         statement = delete(self.model).where(self.model.id == obj_id)
         await db.execute(statement)
-        await db.commit()
         self._logger.info(f"UserAppliance hard deleted: {obj_id}")
         return
 
@@ -273,7 +261,7 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
     ) -> ApplianceCatalog:
         """Create an catalog"""
         db.add(catalog_in)
-        await db.commit()
+        await db.flush()
         await db.refresh(catalog_in)
         self._logger.info(f"Catalog created: {catalog_in.category_id}")
         return catalog_in
@@ -288,7 +276,6 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
             ApplianceCatalog.category_id == obj_id
         )
         await db.execute(statement)
-        await db.commit()
         self._logger.info(f"Appliance Catalog hard deleted: {obj_id}")
         return
 
@@ -333,10 +320,24 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
 
         statement = delete(ApplianceEstimate).where(ApplianceEstimate.id == estimate_id)
         await db.execute(statement)
-        await db.commit()
         self._logger.info(f"ApplianceEstimate hard deleted: {estimate_id}")
         return
 
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def delete_estimates_by_appliance(
+        self, db: AsyncSession, *, appliance_id: uuid.UUID
+    ) -> None:
+        """Delete every estimate of an appliance in one statement"""
+        statement = delete(ApplianceEstimate).where(
+            ApplianceEstimate.user_appliance_id == appliance_id
+        )
+        await db.execute(statement)
+        self._logger.info(f"ApplianceEstimates deleted for appliance {appliance_id}")
+        return
+
     # ==================== HELPER METHODS ====================
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -364,13 +365,5 @@ class UserApplianceRepository(BaseRepository[UserAppliance]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
-    def _apply_ordering(self, query, order_by: str, order_desc: bool):
-        """Apply ordering to query."""
-        order_column = getattr(self.model, order_by, self.model.created_at)
-        if order_desc:
-            return query.order_by(order_column.desc())
-        else:
-            return query.order_by(order_column.asc())
-
 
 appliance_repository = UserApplianceRepository()
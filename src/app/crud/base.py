@@ -0,0 +1,184 @@
+# app/crud/base.py
+import logging
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.app.core.exception_utils import handle_exceptions
+from src.app.core.exceptions import InternalServerError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BaseRepository(Generic[T]):
+    """
+    Generic async repository shared by the model repositories.
+
+    Subclasses keep their model-specific queries; the batched helpers here
+    never commit. They flush, so generated columns and constraint errors
+    surface immediately, and the caller's transaction decides when the
+    writes become durable. A service can therefore combine several of them
+    into one transaction.
+    """
+
+    # Fields that may arrive as ISO-8601 strings in fields_to_update
+    datetime_fields: FrozenSet[str] = frozenset({"created_at", "updated_at"})
+
+    # Column sets upsert() refuses as a conflict target because no unique
+    # index backs them (on every schema variant). Override per model.
+    unsupported_conflict_targets: FrozenSet[FrozenSet[str]] = frozenset()
+
+    def __init__(self, model: type[T]):
+        self.model = model
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def _load_options(self) -> List[Any]:
+        """Relationship loaders applied by get/get_many. Override per model."""
+        return []
+
+    def _set_fields(self, db_obj: T, fields_to_update: Dict[str, Any]) -> T:
+        """Apply a partial update to a loaded object (no flush)."""
+        for field, value in fields_to_update.items():
+            if field in self.datetime_fields and isinstance(value, str):
+                try:
+                    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                except ValueError:
+                    value = datetime.now(timezone.utc)
+
+            setattr(db_obj, field, value)
+        return db_obj
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get(self, db: AsyncSession, *, obj_id: Any) -> Optional[T]:
+        """Get entity by its primary key."""
+        statement = (
+            select(self.model)
+            .where(self.model.id == obj_id)
+            .options(*self._load_options())
+        )
+        result = await db.execute(statement)
+        return result.scalar_one_or_none()
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_many(self, db: AsyncSession, *, ids: Iterable[Any]) -> List[T]:
+        """Get several entities by primary key in one query. Order is not guaranteed."""
+        ids = list(ids)
+        if not ids:
+            return []
+        statement = (
+            select(self.model)
+            .where(self.model.id.in_(ids))
+            .options(*self._load_options())
+        )
+        result = await db.execute(statement)
+        return list(result.scalars().all())
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def bulk_create(self, db: AsyncSession, *, objs: Sequence[T]) -> List[T]:
+        """Insert pre-constructed model objects in one flush."""
+        objs = list(objs)
+        if not objs:
+            return []
+        db.add_all(objs)
+        await db.flush()
+        self._logger.debug(f"{len(objs)} {self.model.__name__} rows inserted")
+        return objs
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def bulk_update(
+        self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]
+    ) -> int:
+        """
+        Update many rows by primary key in one executemany UPDATE.
+
+        Every dict must contain "id" plus the columns to change. Objects
+        already loaded in the session are not refreshed.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        await db.execute(update(self.model), rows)
+        self._logger.debug(f"{len(rows)} {self.model.__name__} rows updated")
+        return len(rows)
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def upsert(
+        self,
+        db: AsyncSession,
+        *,
+        rows: Sequence[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> List[T]:
+        """
+        INSERT ... ON CONFLICT (conflict_columns) DO UPDATE ... RETURNING *.
+
+        update_columns defaults to every supplied column outside the conflict
+        target; pass an empty list for DO NOTHING, in which case only the
+        newly inserted rows come back. Returned objects replace any stale
+        copies in the session's identity map.
+        """
+        if frozenset(conflict_columns) in self.unsupported_conflict_targets:
+            raise InternalServerError(
+                detail=f"{self.model.__name__} cannot be upserted on "
+                f"({', '.join(conflict_columns)}): no unique index covers it."
+            )
+        rows = list(rows)
+        if not rows:
+            return []
+
+        statement = pg_insert(self.model).values(rows)
+        if update_columns is None:
+            update_columns = [
+                column
+                for column in rows[0]
+                if column not in conflict_columns and column != "id"
+            ]
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: statement.excluded[column] for column in update_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=list(conflict_columns)
+            )
+
+        orm_statement = (
+            select(self.model)
+            .from_statement(statement.returning(self.model))
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(orm_statement)
+        return list(result.scalars().all())
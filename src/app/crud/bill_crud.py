@@ -1,46 +1,94 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime, timezone
+from datetime import date, timedelta
+from enum import Enum
+from typing import Optional, Dict, Any
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, and_, or_, delete
+from sqlmodel import select, and_, or_, delete
 from src.app.models.appliance_model import UserAppliance
 from src.app.core.exception_utils import handle_exceptions
 from src.app.core.exceptions import InternalServerError
+from src.app.crud.base import BaseRepository
+from src.app.crud.pagination import Page, paginate
 
 from src.app.models.bill_model import Bill, BillStatus
 
 logger = logging.getLogger(__name__)
 
 
-class BillRepository:
+class BillLoad(str, Enum):
+    """How much of a bill's object graph a query loads."""
+
+    # Bill columns plus appliances -> estimates and estimates (API detail view)
+    DETAILED = "detailed"
+    # Bill columns only, for callers that read or update the bill itself
+    SUMMARY = "summary"
+
+
+class BillRepository(BaseRepository[Bill]):
     """Repository for all database operations related to the User model."""
 
+    datetime_fields = frozenset({"created_at"})
+
+    # Once bills is partitioned (migration 7d41c2e9a8f0) the only unique key
+    # is (id, billing_period_start), which the unpartitioned table lacks, so
+    # no conflict target involving id works in both layouts.
+    unsupported_conflict_targets = frozenset(
+        {frozenset({"id"}), frozenset({"id", "billing_period_start"})}
+    )
+
+    # get_latest_by_user first looks only at bills whose period started this
+    # recently. The bound lets a partitioned bills table prune to the latest
+    # partitions; an older history falls back to an unbounded lookup.
+    latest_lookback = timedelta(days=400)
+
     def __init__(self, model: type[Bill] = Bill):
-        # Corrected __init__
-        self.model = model
+        super().__init__(model)
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    def _load_options(self, load: BillLoad = BillLoad.DETAILED):
+        if load == BillLoad.SUMMARY:
+            return []
+        return [
+            selectinload(self.model.user_appliances).selectinload(
+                UserAppliance.estimates
+            ),
+            selectinload(self.model.estimates),
+        ]
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
     )
-    async def get(self, db: AsyncSession, *, bill_id: uuid.UUID) -> Optional[Bill]:
+    async def get(
+        self,
+        db: AsyncSession,
+        *,
+        obj_id: uuid.UUID,
+        load: BillLoad = BillLoad.DETAILED,
+    ) -> Optional[Bill]:
         """Get a bill by it's ID"""
         statement = (
             select(self.model)
-            .where(self.model.id == bill_id)
-            .options(
-                selectinload(self.model.user_appliances).selectinload(
-                    UserAppliance.estimates
-                ),
-                selectinload(self.model.estimates),
-            )
+            .where(self.model.id == obj_id)
+            .options(*self._load_options(load))
         )
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_owner_id(
+        self, db: AsyncSession, *, bill_id: uuid.UUID
+    ) -> Optional[uuid.UUID]:
+        """Ownership check: the bill's user_id, or None if the bill doesn't exist"""
+        statement = select(self.model.user_id).where(self.model.id == bill_id)
+        result = await db.execute(statement)
+        return result.scalar_one_or_none()
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
@@ -65,10 +113,11 @@ class BillRepository:
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Bill], int]:
+    ) -> Page:
         """Get multiple bills with filtering and pagination."""
         query = select(self.model)
 
@@ -76,19 +125,18 @@ class BillRepository:
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        bills = result.scalars().all()
-
-        return bills, total
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            # Unfiltered admin listings report the planner's row estimate
+            estimate_total=not filters,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -101,39 +149,67 @@ class BillRepository:
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Bill], int]:
+        load: BillLoad = BillLoad.DETAILED,
+    ) -> Page:
         """Get multiple bills with filtering and pagination."""
         query = (
             select(self.model)
             .where(self.model.user_id == user_id)  # <-- enforce scoping
-            .options(
-                selectinload(self.model.user_appliances).selectinload(
-                    UserAppliance.estimates
-                ),
-                selectinload(self.model.estimates),
-            )
+            .options(*self._load_options(load))
         )
 
         # Apply filters
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_my_bill_ids(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+    ) -> Page:
+        """Get one page of a user's bill IDs (no relationships loaded)."""
+        query = select(self.model.id).where(self.model.user_id == user_id)
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        bills = result.scalars().all()
+        # Apply filters
+        if filters:
+            query = self._apply_filters(query, filters)
 
-        return bills, total
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -154,8 +230,16 @@ class BillRepository:
             .order_by(self.model.billing_period_end.desc())
             .limit(1)
         )
-        result = await db.execute(statement)
-        return result.scalar_one_or_none()
+        recent_start = date.today() - self.latest_lookback
+        result = await db.execute(
+            statement.where(self.model.billing_period_start >= recent_start)
+        )
+        bill = result.scalar_one_or_none()
+        if bill is None:
+            # No recent bill: search the whole history
+            result = await db.execute(statement)
+            bill = result.scalar_one_or_none()
+        return bill
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -165,7 +249,7 @@ class BillRepository:
         """Create a bill"""
 
         db.add(bill_data)
-        await db.commit()
+        await db.flush()
         await db.refresh(bill_data)
         self._logger.info(f"Bill created: {bill_data}")
         return bill_data
@@ -179,17 +263,10 @@ class BillRepository:
     ) -> Bill:
         # Updates specific fields of a bill object.
 
-        for field, value in fields_to_update.items():
-            if field in {"created_at"} and isinstance(value, str):
-                try:
-                    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    value = datetime.now(timezone.utc)
-
-            setattr(bill, field, value)
+        self._set_fields(bill, fields_to_update)
 
         db.add(bill)
-        await db.commit()
+        await db.flush()
         await db.refresh(bill)
 
         self._logger.info(
@@ -205,7 +282,6 @@ class BillRepository:
         """Delete a bill by it's ID"""
         statement = delete(self.model).where(self.model.id == bill_id)
         await db.execute(statement)
-        await db.commit()
         self._logger.info(f"Bill hard deleted: {bill_id}")
         return
 
@@ -219,6 +295,13 @@ class BillRepository:
         if "source_type" in filters and filters["source_type"] is not None:
             conditions.append(Bill.source_type == filters["source_type"])
 
+        # Bounds on the partition key, so partitioned bills can be pruned
+        if "period_from" in filters and filters["period_from"] is not None:
+            conditions.append(Bill.billing_period_start >= filters["period_from"])
+
+        if "period_to" in filters and filters["period_to"] is not None:
+            conditions.append(Bill.billing_period_start <= filters["period_to"])
+
         if "search" in filters and filters["search"]:
             search_term = f"%{filters['search']}%"
             conditions.append(
@@ -232,13 +315,5 @@ class BillRepository:
 
         return query
 
-    def _apply_ordering(self, query, order_by: str, order_desc: bool):
-        """Apply ordering to query."""
-        order_column = getattr(self.model, order_by, self.model.created_at)
-        if order_desc:
-            return query.order_by(order_column.desc())
-        else:
-            return query.order_by(order_column.asc())
-
 
 bill_repository = BillRepository()
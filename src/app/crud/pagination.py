@@ -0,0 +1,246 @@
+# app/crud/pagination.py
+"""
+Shared list-page helper for the repositories.
+
+Pages are ordered by (order column, id), so a page can be addressed either by
+offset (page/size) or by an opaque cursor that encodes the last row's
+(order value, id). Cursor pages use a keyset predicate instead of OFFSET, so
+page 500 costs the same as page 1.
+
+The total comes back in the same statement as the rows via count(*) OVER ().
+It is only computed for offset pages, since a keyset predicate would make it
+count the remaining rows rather than all of them. For unfiltered admin
+listings it can come from the planner's pg_class.reltuples estimate instead.
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, text, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.app.core.exceptions import ValidationError
+
+
+class Page(NamedTuple):
+    """One page of rows plus what the list response needs to describe it."""
+
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+    total_is_estimate: bool = False
+
+    def meta(self, *, skip: int, limit: int, cursor: Optional[str] = None) -> Dict:
+        """Pagination fields for the *ListResponse schemas."""
+        if cursor is not None or self.total is None:
+            page = pages = None
+        else:
+            page = (skip // limit) + 1
+            pages = (self.total + limit - 1) // limit  # Ceiling division
+        return {
+            "total": self.total,
+            "page": page,
+            "pages": pages,
+            "size": limit,
+            "next_cursor": self.next_cursor,
+            "total_is_estimate": self.total_is_estimate,
+        }
+
+
+# ================== CURSORS ==================
+def _encode_value(value: Any) -> List[Any]:
+    if value is None:
+        return ["n", None]
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["u", str(value)]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    return ["v", value]
+
+
+def _decode_value(tag: str, raw: Any) -> Any:
+    if tag == "n":
+        return None
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "u":
+        return uuid.UUID(raw)
+    if tag == "dec":
+        return Decimal(raw)
+    if tag == "v":
+        return raw
+    raise ValueError(f"unknown cursor value tag {tag!r}")
+
+
+def encode_cursor(order_key: str, order_desc: bool, value: Any, row_id: Any) -> str:
+    """Opaque cursor pointing just past the row with (value, row_id)."""
+    payload = [order_key, int(order_desc), *_encode_value(value), str(row_id)]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, order_key: str, order_desc: bool
+) -> Tuple[Any, uuid.UUID]:
+    """Inverse of encode_cursor; rejects cursors issued for another ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, desc, tag, value, row_id = json.loads(raw)
+        value = _decode_value(tag, value)
+        row_id = uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor", field="cursor")
+
+    if key != order_key or bool(desc) != order_desc:
+        raise ValidationError(
+            "Cursor was issued for a different ordering", field="cursor"
+        )
+    return value, row_id
+
+
+def _keyset_condition(order_column, id_column, order_desc: bool, value, row_id):
+    """Rows strictly after (value, row_id) in Postgres' default NULL placement."""
+    # DESC sorts NULLs first and ASC sorts them last
+    if value is None:
+        if order_desc:
+            return or_(
+                and_(order_column.is_(None), id_column < row_id),
+                order_column.isnot(None),
+            )
+        return and_(order_column.is_(None), id_column > row_id)
+
+    # The redundant bound on the order column alone is what the planner can
+    # use for index ranges and partition pruning; the row comparison isn't
+    if order_desc:
+        return and_(
+            order_column <= value,
+            tuple_(order_column, id_column) < tuple_(value, row_id),
+        )
+    condition = and_(
+        order_column >= value,
+        tuple_(order_column, id_column) > tuple_(value, row_id),
+    )
+    if getattr(order_column.expression, "nullable", True):
+        condition = or_(condition, order_column.is_(None))
+    return condition
+
+
+# ================== TOTALS ==================
+async def estimate_row_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """Planner row estimate for a table; None if it was never analyzed."""
+    # A partitioned parent holds no rows itself (reltuples is -1), so sum
+    # the analyzed leaf partitions instead
+    result = await db.execute(
+        text(
+            """
+            SELECT CASE WHEN c.relkind = 'p' THEN (
+                       SELECT sum(leaf.reltuples) FILTER (WHERE leaf.reltuples >= 0)
+                       FROM pg_partition_tree(c.oid) AS tree
+                       JOIN pg_class AS leaf ON leaf.oid = tree.relid
+                       WHERE tree.isleaf
+                   ) ELSE c.reltuples END::bigint
+            FROM pg_class AS c
+            WHERE c.oid = to_regclass(:t)
+            """
+        ),
+        {"t": table_name},
+    )
+    estimate = result.scalar_one_or_none()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+# ================== PAGINATION ==================
+async def paginate(
+    db: AsyncSession,
+    query,
+    *,
+    model,
+    order_by: str = "created_at",
+    order_desc: bool = True,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+) -> Page:
+    """
+    Run one page of `query` (a select of `model` or of its columns).
+
+    Returns the first selected entity/column of each row. With a cursor the
+    page starts after the cursor's row and `skip` is ignored; otherwise it is
+    an offset page. estimate_total swaps the exact count for the table's
+    reltuples estimate (only meaningful when `query` is unfiltered).
+    """
+    order_column = getattr(model, order_by, model.created_at)
+    order_key = order_column.key
+    id_column = model.id
+
+    if cursor is not None:
+        value, row_id = decode_cursor(cursor, order_key, order_desc)
+        query = query.where(
+            _keyset_condition(order_column, id_column, order_desc, value, row_id)
+        )
+        skip = 0
+
+    if order_desc:
+        query = query.order_by(order_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(order_column.asc(), id_column.asc())
+
+    total = None
+    is_estimate = False
+    if include_total and cursor is None and estimate_total:
+        total = await estimate_row_count(db, model.__tablename__)
+        is_estimate = total is not None
+    window_total = include_total and cursor is None and not is_estimate
+
+    columns = [order_column.label("page_key"), id_column.label("page_id")]
+    if window_total:
+        columns.append(func.count().over().label("page_total"))
+
+    # One extra row tells us whether there is a next page
+    statement = query.add_columns(*columns).offset(skip).limit(limit + 1)
+    rows = (await db.execute(statement)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if window_total:
+        if rows:
+            total = rows[0].page_total
+        elif skip == 0:
+            total = 0
+        else:
+            # Past the last page, so no row carried the window count
+            count_query = select(func.count()).select_from(
+                query.order_by(None).subquery()
+            )
+            total = (await db.execute(count_query)).scalar_one()
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            order_key, order_desc, last.page_key, last.page_id
+        )
+
+    return Page(
+        items=[row[0] for row in rows],
+        total=total,
+        next_cursor=next_cursor,
+        total_is_estimate=is_estimate,
+    )
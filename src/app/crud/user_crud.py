@@ -1,49 +1,20 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
-from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from typing import Optional, Dict, Any
 
+from sqlalchemy import update
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, func, and_, or_, delete
 
 from src.app.core.exception_utils import handle_exceptions
 from src.app.core.exceptions import InternalServerError
+from src.app.crud.base import BaseRepository
+from src.app.crud.pagination import Page, paginate
 
 from src.app.models.user_model import User
 
 logger = logging.getLogger(__name__)
 
-T = TypeVar("T")
-
-
-class BaseRepository(ABC, Generic[T]):
-    """Abstract base repository providing consistent interface for database operations."""
-
-    def __init__(self, model: type[T]):
-        self.model = model
-
-    @abstractmethod
-    async def get(self, db: AsyncSession, *, obj_id: Any) -> Optional[T]:
-        """Get entity by its primary key."""
-        pass
-
-    @abstractmethod
-    async def create(self, db: AsyncSession, *, obj_in: Any) -> T:
-        """Create a new entity."""
-        pass
-
-    @abstractmethod
-    async def update(self, db: AsyncSession, *, db_obj: T, obj_in: Any) -> T:
-        """Update an existing entity."""
-        pass
-
-    @abstractmethod
-    async def delete(self, db: AsyncSession, *, obj_id: Any) -> None:
-        """Delete an entity by its primary key."""
-        pass
-
-
 class UserRepository(BaseRepository[User]):
     """Repository for all database operations related to the User model."""
 
@@ -97,10 +68,11 @@ class UserRepository(BaseRepository[User]):
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[User], int]:
+    ) -> Page:
         """Get multiple users with filtering and pagination."""
         query = select(self.model)
 
@@ -108,19 +80,18 @@ class UserRepository(BaseRepository[User]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        users = result.scalars().all()
-
-        return users, total
+        return await paginate(
+            db,
+            query,
+            model=self.model,
+            order_by=order_by,
+            order_desc=order_desc,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            # Unfiltered admin listings report the planner's row estimate
+            estimate_total=not filters,
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -145,7 +116,7 @@ class UserRepository(BaseRepository[User]):
     async def create(self, db: AsyncSession, *, db_obj: User) -> User:
         """Create a new user. Expects a pre-constructed User model object."""
         db.add(db_obj)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_obj)
         self._logger.info(f"User created: {db_obj.id}")
         return db_obj
@@ -160,17 +131,10 @@ class UserRepository(BaseRepository[User]):
         """
         Updates specific fields of a user object.
         """
-        for field, value in fields_to_update.items():
-            if field in {"created_at", "updated_at"} and isinstance(value, str):
-                try:
-                    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                except ValueError:
-                    value = datetime.now(timezone.utc)
-
-            setattr(user, field, value)
+        self._set_fields(user, fields_to_update)
 
         db.add(user)
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
 
         self._logger.info(
@@ -178,6 +142,25 @@ class UserRepository(BaseRepository[User]):
         )
         return user
 
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def replace_password_hash(
+        self, db: AsyncSession, *, user_id: uuid.UUID, old_hash: str, new_hash: str
+    ) -> bool:
+        """
+        Swap old_hash for new_hash in one conditional UPDATE. Returns False
+        (and changes nothing) if the password was changed in the meantime.
+        """
+        statement = (
+            update(self.model)
+            .where(self.model.id == user_id, self.model.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        result = await db.execute(statement)
+        return result.rowcount == 1
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
@@ -186,7 +169,6 @@ class UserRepository(BaseRepository[User]):
         """Permanently delete a user by ID."""
         statement = delete(self.model).where(self.model.id == obj_id)
         await db.execute(statement)
-        await db.commit()
         self._logger.info(f"User hard deleted: {obj_id}")
         return
 
@@ -256,13 +238,5 @@ class UserRepository(BaseRepository[User]):
 
         return query
 
-    def _apply_ordering(self, query, order_by: str, order_desc: bool):
-        """Apply ordering to query."""
-        order_column = getattr(self.model, order_by, self.model.created_at)
-        if order_desc:
-            return query.order_by(order_column.desc())
-        else:
-            return query.order_by(order_column.asc())
-
 
 user_repository = UserRepository()
@@ -0,0 +1,167 @@
+# app/db/partitioning.py
+"""
+Range partitioning of bills by billing_period_start.
+
+Opt-in: migration 7d41c2e9a8f0 only rebuilds the tables when
+BILL_PARTITIONING_ENABLED is set. appliance_estimates is partitioned on the
+same key with the same yearly bounds, so a bill and its estimates always sit
+in the same year's partitions. Each table also gets a DEFAULT partition for
+rows outside every range, e.g. the 1970-01-01 placeholder period a bill
+carries until it has been parsed.
+
+Postgres only enforces unique keys that include the partition key, so a
+partitioned bills table has (id, billing_period_start) as its primary key
+and bills.id alone is unique only by virtue of UUID generation. Nothing can
+target ON CONFLICT (id) on it; see BillRepository.unsupported_conflict_targets.
+
+The migration creates partitions up to BILL_PARTITION_YEARS_AHEAD years past
+the current one, and the tasks.maintain_bill_partitions beat task keeps that
+window rolling forward.
+
+Postgres refuses to create a range partition while the DEFAULT partition
+holds rows inside that range, e.g. a bill with a misparsed far-future
+period. ensure_partitions skips such a year (for both tables, keeping their
+bounds identical) and logs the row count; the other years are still created.
+Once those rows are corrected or deleted, the next run creates the year.
+"""
+import logging
+from datetime import date
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITION_KEY = "billing_period_start"
+
+# Partitioned together with identical bounds (bills first: it is referenced)
+PARTITIONED_TABLES = ("bills", "appliance_estimates")
+
+# Earliest yearly partition; older periods fall into the DEFAULT partition
+HISTORY_START_YEAR = 2000
+
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_y{year}"
+
+
+def create_partition_sql(table: str, year: int, parent: Optional[str] = None) -> str:
+    """DDL for one yearly partition. `parent` defaults to `table`."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, year)} "
+        f"PARTITION OF {parent or table} "
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def _year_bounds(year: int):
+    return {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)}
+
+
+def create_default_partition_sql(table: str, parent: Optional[str] = None) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_default "
+        f"PARTITION OF {parent or table} DEFAULT"
+    )
+
+
+def partition_years(
+    first_year: Optional[int] = None,
+    years_ahead: int = settings.BILL_PARTITION_YEARS_AHEAD,
+    today: Optional[date] = None,
+) -> Iterable[int]:
+    """Years that should have a partition: first_year through today + years_ahead."""
+    current = (today or date.today()).year
+    start = max(first_year or current, HISTORY_START_YEAR)
+    return range(min(start, current), current + years_ahead + 1)
+
+
+async def is_partitioned(db: AsyncSession, table: str = "bills") -> bool:
+    result = await db.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )
+    return bool(result.scalar_one_or_none())
+
+
+async def ensure_partitions(
+    db: AsyncSession, *, years_ahead: int = settings.BILL_PARTITION_YEARS_AHEAD
+) -> List[str]:
+    """
+    Create any missing partitions from the current year to years_ahead.
+
+    A no-op unless bills is partitioned. Returns the partitions created.
+    Runs in the caller's transaction, one savepoint per year, so a year that
+    can't be created (see the module docstring) never aborts the others.
+    """
+    if not await is_partitioned(db):
+        return []
+
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent IN (
+                to_regclass('bills'), to_regclass('appliance_estimates')
+            )
+            """
+        )
+    )
+    existing = set(result.scalars().all())
+
+    created = []
+    for year in partition_years(years_ahead=years_ahead):
+        missing = [
+            table
+            for table in PARTITIONED_TABLES
+            if partition_name(table, year) not in existing
+        ]
+        if not missing:
+            continue
+
+        stranded = await _default_rows_in_year(db, year)
+        if stranded:
+            logger.warning(
+                f"Skipping {year} partitions: {stranded} rows for that year sit "
+                f"in the DEFAULT partitions; fix their billing_period_start first"
+            )
+            continue
+
+        try:
+            async with db.begin_nested():
+                for table in missing:
+                    await db.execute(text(create_partition_sql(table, year)))
+        except DBAPIError:
+            logger.error(f"Could not create {year} partitions", exc_info=True)
+            continue
+        created.extend(partition_name(table, year) for table in missing)
+
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+async def _default_rows_in_year(db: AsyncSession, year: int) -> int:
+    """Rows in either DEFAULT partition that belong to `year`'s range."""
+    total = 0
+    for table in PARTITIONED_TABLES:
+        exists = await db.execute(
+            text("SELECT to_regclass(:t) IS NOT NULL"), {"t": f"{table}_default"}
+        )
+        if not exists.scalar_one():
+            continue
+        result = await db.execute(
+            text(
+                f"SELECT count(*) FROM {table}_default "
+                f"WHERE {PARTITION_KEY} >= :start AND {PARTITION_KEY} < :end"
+            ),
+            _year_bounds(year),
+        )
+        total += result.scalar_one()
+    return total
@@ -5,3 +5,7 @@ from app.core.config import settings
 redis_client = redis.from_url(
     f"{settings.REDIS_URL}", encoding="utf-8", decode_responses=True
 )
+
+# Binary-safe client for values that are not UTF-8 text (e.g. compressed
+# cache entries).
+redis_binary_client = redis.from_url(f"{settings.REDIS_URL}")
@@ -1,6 +1,7 @@
+import inspect
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
 from src.app.core.exceptions import InternalServerError
 
@@ -13,6 +14,28 @@ from app.core.config import settings
 # Setup logging
 logger = logging.getLogger(__name__)
 
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """
+    Defer a side effect (cache invalidation, task dispatch) until the session's
+    unit of work has committed. Repositories only flush, so acting earlier
+    could let a reader re-cache the old rows or a worker miss the new ones.
+    The callback may return an awaitable. Dropped if the transaction rolls back.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.error("After-commit callback failed.", exc_info=True)
+
 
 class Database:
     """
@@ -58,21 +81,34 @@ class Database:
         logger.info("Closing database connection pool.")
         await self._engine.dispose()
 
+    @staticmethod
+    async def commit(session: AsyncSession) -> None:
+        """Commit the unit of work, then run its after-commit callbacks."""
+        await session.commit()
+        await _run_after_commit(session)
+
+    @staticmethod
+    async def rollback(session: AsyncSession) -> None:
+        session.info.pop(_AFTER_COMMIT, None)
+        await session.rollback()
+
     @asynccontextmanager
     async def session_context(self) -> AsyncGenerator[AsyncSession, None]:
         """
         Provides a session within a context manager for use outside of FastAPI
-        dependencies (e.g., in background tasks or scripts).
+        dependencies (e.g., in background tasks or scripts). Like get_session,
+        it is one unit of work: a single commit when the block exits.
         """
         async with self._session_factory() as session:
             try:
                 yield session
-                await session.commit()
+                await self.commit(session)
             except SQLAlchemyError as e:
                 logger.error("Session commit failed, rolling back.", exc_info=True)
-                await session.rollback()
+                await self.rollback(session)
                 raise
             finally:
+                session.info.pop(_AFTER_COMMIT, None)
                 await session.close()
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -80,20 +116,22 @@ class Database:
         FastAPI dependency to get a database session.
         This implements the "Unit of Work" pattern: a single transaction per request.
         It yields a session, commits if the request is successful, and rolls back on any exception.
+        Repositories only flush; use after_commit() for work that must follow the
+        commit and session.begin_nested() for a savepoint inside the request.
         """
         async with self._session_factory() as session:
             try:
                 yield session
-                await session.commit()
+                await self.commit(session)
             except SQLAlchemyError as e:
-                await session.rollback()
+                await self.rollback(session)
                 # You can log the specific DB error here if needed
                 logger.error("Database transaction failed, rolling back.", exc_info=e)
                 # Re-raise a more generic server error to avoid leaking details
                 raise InternalServerError("A database error occurred.") from e
             except Exception:
                 # Catch non-DB exceptions too
-                await session.rollback()
+                await self.rollback(session)
                 raise
 
 # --- Create a single, reusable database instance ---
@@ -5,7 +5,9 @@ from typing import Dict, Any
 from src.app.core.config import settings
 from src.app.core.exception_handler import register_exception_handlers
 from src.app.core.middleware import register_middlewares
+from src.app.core.security import password_manager, token_manager
 from src.app.db.session import db
+from src.app.services.cache_service import cache_service
 from src.app.utils.deps import get_health_status
 from src.app.api.v1.endpoints import user, auth, admin, bill, appliance, insights
 from src.app.db import base
@@ -17,10 +19,19 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Connect to the database
     await db.connect()
+    # Subscribe to cache invalidations so the in-process cache tier can be used
+    await cache_service.start()
+    # Keep a local filter of revoked tokens so most requests skip the blacklist
+    if token_manager.revocation_filter is not None:
+        await token_manager.revocation_filter.start()
 
     yield
 
     # Shutdown: Disconnect from the database
+    if token_manager.revocation_filter is not None:
+        await token_manager.revocation_filter.close()
+    await cache_service.close()
+    password_manager.pool.shutdown()
     await db.disconnect()
 
 
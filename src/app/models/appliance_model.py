@@ -1,10 +1,10 @@
 # app/models/appliance_model.py
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List, TYPE_CHECKING
 
-from sqlalchemy import func, Column, DateTime
+from sqlalchemy import func, Column, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlmodel import Field, SQLModel, Relationship
 
@@ -43,6 +43,13 @@ class UserApplianceBase(SQLModel):
 
 class UserAppliance(UserApplianceBase, table=True):
     __tablename__ = "user_appliances"
+    # Created by migration 3c9e1b7d52a4; declared here so autogenerate keeps them
+    __table_args__ = (
+        Index("ix_user_appliances_user_id_custom_name", "user_id", "custom_name"),
+        Index(
+            "ix_user_appliances_user_id_created_at", "user_id", "created_at", "id"
+        ),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -102,6 +109,9 @@ class ApplianceEstimate(ApplianceEstimateBase, table=True):
     user_appliance_id: uuid.UUID = Field(
         foreign_key="user_appliances.id", index=True, nullable=False
     )
+    # Copy of the bill's period; the partition key when bills are partitioned
+    # (see app/db/partitioning.py), so it must be set on insert
+    billing_period_start: Optional[date] = Field(default=None)
 
     bill: "Bill" = Relationship(back_populates="estimates")
     user_appliance: "UserAppliance" = Relationship(back_populates="estimates")
@@ -5,7 +5,7 @@ from datetime import datetime, date
 from typing import Dict, Any, Optional, TYPE_CHECKING, List
 from enum import Enum as PyEnum
 
-from sqlalchemy import func, Column, DateTime
+from sqlalchemy import func, Column, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy import Enum as SAEnum
 from sqlmodel import Field, SQLModel, Relationship
@@ -65,7 +65,37 @@ class BillBase(SQLModel):
 
 class Bill(BillBase, table=True):
     __tablename__ = "bills"
+    # Created by migration 3c9e1b7d52a4; declared here so autogenerate keeps them
+    __table_args__ = (
+        Index(
+            "ix_bills_user_id_billing_period_start",
+            "user_id",
+            "billing_period_start",
+            "id",
+        ),
+        Index("ix_bills_user_id_created_at", "user_id", "created_at", "id"),
+        Index(
+            "ix_bills_user_id_latest_success",
+            "user_id",
+            "billing_period_end",
+            postgresql_where=text("parse_status = 'SUCCESS'"),
+        ),
+        Index(
+            "ix_bills_user_id_checksum",
+            "user_id",
+            "checksum",
+            postgresql_where=text("checksum IS NOT NULL"),
+        ),
+        Index(
+            "ix_bills_provider_trgm",
+            "provider",
+            postgresql_using="gin",
+            postgresql_ops={"provider": "gin_trgm_ops"},
+        ),
+    )
 
+    # When bills is partitioned (app/db/partitioning.py) the database key is
+    # (id, billing_period_start); ids are still unique, so the mapper keeps id
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
         sa_column=Column(
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING, List
 from enum import Enum as PyEnum
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy import func, Column, String, DateTime
+from sqlalchemy import func, Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import (
     UUID as PG_UUID,
 )
@@ -54,6 +54,16 @@ class UserBase(SQLModel):
 # This is the database table model.
 class User(UserBase, table=True):
     __tablename__ = "users"
+    # Trigram indexes for the ILIKE search filter (migration 3c9e1b7d52a4)
+    __table_args__ = tuple(
+        Index(
+            f"ix_users_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+        for column in ("email", "username", "first_name")
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
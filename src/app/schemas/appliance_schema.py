@@ -294,20 +294,32 @@ class UserApplianceListResponse(BaseModel):
     items: List[UserApplianceDetailedResponse] = Field(
         ..., description="List of appliances"
     )
-    total: int = Field(..., ge=0, description="Total number of appliances")
-    page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total number of pages")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of appliances (omitted on cursor pages)"
+    )
+    page: Optional[int] = Field(
+        None, ge=1, description="Current page number (offset pages only)"
+    )
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (offset pages only)"
+    )
     size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; null on the last page"
+    )
+    total_is_estimate: bool = Field(
+        False, description="Whether total is the planner's row estimate"
+    )
 
     @property
     def has_next(self) -> bool:
         """Check if there's a next page."""
-        return self.page < self.pages
+        return self.next_cursor is not None
 
     @property
     def has_previous(self) -> bool:
         """Check if there's a previous page."""
-        return self.page > 1
+        return self.page is not None and self.page > 1
 
 
 class UserApplianceSearchParams(BaseModel):
@@ -188,20 +188,32 @@ class BillListResponse(BaseModel):
     """Response for paginated user list."""
 
     items: List[BillResponse] = Field(..., description="List of bills")
-    total: int = Field(..., ge=0, description="Total number of bills")
-    page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total number of pages")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of bills (omitted on cursor pages)"
+    )
+    page: Optional[int] = Field(
+        None, ge=1, description="Current page number (offset pages only)"
+    )
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (offset pages only)"
+    )
     size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; null on the last page"
+    )
+    total_is_estimate: bool = Field(
+        False, description="Whether total is the planner's row estimate"
+    )
 
     @property
     def has_next(self) -> bool:
         """Check if there's a next page."""
-        return self.page < self.pages
+        return self.next_cursor is not None
 
     @property
     def has_previous(self) -> bool:
         """Check if there's a previous page."""
-        return self.page > 1
+        return self.page is not None and self.page > 1
 
 
 class BillUserListResponse(BaseModel):
@@ -210,20 +222,32 @@ class BillUserListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     items: List[BillDetailedResponse] = Field(..., description="List of bills")
-    total: int = Field(..., ge=0, description="Total number of bills")
-    page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total number of pages")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of bills (omitted on cursor pages)"
+    )
+    page: Optional[int] = Field(
+        None, ge=1, description="Current page number (offset pages only)"
+    )
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (offset pages only)"
+    )
     size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; null on the last page"
+    )
+    total_is_estimate: bool = Field(
+        False, description="Whether total is the planner's row estimate"
+    )
 
     @property
     def has_next(self) -> bool:
         """Check if there's a next page."""
-        return self.page < self.pages
+        return self.next_cursor is not None
 
     @property
     def has_previous(self) -> bool:
         """Check if there's a previous page."""
-        return self.page > 1
+        return self.page is not None and self.page > 1
 
 
 class BillSearchParams(BaseModel):
@@ -242,6 +266,12 @@ class BillSearchParams(BaseModel):
     created_before: Optional[date] = Field(
         None, description="Filter users created before this date"
     )
+    period_from: Optional[date] = Field(
+        None, description="Filter bills whose billing period starts on/after this date"
+    )
+    period_to: Optional[date] = Field(
+        None, description="Filter bills whose billing period starts on/before this date"
+    )
 
     @model_validator(mode="after")
     def validate_date_range(self) -> "BillSearchParams":
@@ -249,6 +279,9 @@ class BillSearchParams(BaseModel):
         if self.created_after and self.created_before:
             if self.created_after > self.created_before:
                 raise ValidationError("created_after must be before created_before")
+        if self.period_from and self.period_to:
+            if self.period_from > self.period_to:
+                raise ValidationError("period_from must be before period_to")
         return self
 
 
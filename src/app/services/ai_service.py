@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 import google.generativeai as genai
@@ -214,34 +215,31 @@ class AIService:
 
         file_part = {"mime_type": mime_type, "data": file_bytes}
 
+        response = None
         try:
             response = self.model.generate_content([self.parser_prompt, file_part])
-            response_json = json.loads(response.text)
-
-            # Inline date normalization
-            if "period" in response_json:
-                period = response_json["period"]
-
-                def normalize(val: str):
-                    if not val:
-                        return None
-                    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"):
-                        try:
-                            return datetime.strptime(val, fmt).date()
-                        except ValueError:
-                            continue
-                    return None
-
-                response_json["period"] = {
-                    **period,
-                    "start": normalize(period.get("start")),
-                    "end": normalize(period.get("end")),
-                    "bill_date": normalize(period.get("bill_date")),
-                    "due_date": normalize(period.get("due_date")),
-                }
+            return self._parse_bill_response(response)
+        except Exception as e:
+            logger.error(
+                f"Gemini parsing or validation failed. Response text: {getattr(response, 'text', 'No response text available')}",
+                exc_info=True,
+            )
+            raise ValueError("Failed to parse bill from AI response.") from e
 
-            return NormalizedBillSchema(**response_json)
+    async def parse_bill_with_gemini_async(
+        self, file_path: str, mime_type: str
+    ) -> NormalizedBillSchema:
+        """Non-blocking parse_bill_with_gemini for use on an event loop."""
+        logger.info(f"Sending file to Gemini for parsing: {file_path}")
+        file_bytes = await asyncio.to_thread(self._read_file, file_path)
+        file_part = {"mime_type": mime_type, "data": file_bytes}
 
+        response = None
+        try:
+            response = await self.model.generate_content_async(
+                [self.parser_prompt, file_part]
+            )
+            return self._parse_bill_response(response)
         except Exception as e:
             logger.error(
                 f"Gemini parsing or validation failed. Response text: {getattr(response, 'text', 'No response text available')}",
@@ -249,6 +247,38 @@ class AIService:
             )
             raise ValueError("Failed to parse bill from AI response.") from e
 
+    @staticmethod
+    def _read_file(file_path: str) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def _parse_bill_response(self, response) -> NormalizedBillSchema:
+        response_json = json.loads(response.text)
+
+        # Inline date normalization
+        if "period" in response_json:
+            period = response_json["period"]
+
+            def normalize(val: str):
+                if not val:
+                    return None
+                for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"):
+                    try:
+                        return datetime.strptime(val, fmt).date()
+                    except ValueError:
+                        continue
+                return None
+
+            response_json["period"] = {
+                **period,
+                "start": normalize(period.get("start")),
+                "end": normalize(period.get("end")),
+                "bill_date": normalize(period.get("bill_date")),
+                "due_date": normalize(period.get("due_date")),
+            }
+
+        return NormalizedBillSchema(**response_json)
+
     def generate_insights_from_context(self, context: dict) -> InsightResponse:
         """Takes the rich 'Monthly Insight Context' and sends it to Gemini to generate actionable insights."""
         logger.info("Sending monthly context to Gemini for insight generation...")
@@ -256,6 +286,7 @@ class AIService:
         # Use the specific prompt for insights
         full_prompt = [self.insight_prompt, json.dumps(context, default=str)]
 
+        response = None
         try:
             response = self.model.generate_content(full_prompt)
             response_json = json.loads(response.text)
@@ -271,6 +302,27 @@ class AIService:
                 "Failed to generate valid insights from AI response."
             ) from e
 
+    async def generate_insights_from_context_async(
+        self, context: dict
+    ) -> InsightResponse:
+        """Non-blocking generate_insights_from_context for use on an event loop."""
+        logger.info("Sending monthly context to Gemini for insight generation...")
+        full_prompt = [self.insight_prompt, json.dumps(context, default=str)]
+
+        response = None
+        try:
+            response = await self.model.generate_content_async(full_prompt)
+            response_json = json.loads(response.text)
+            return InsightResponse.model_validate(response_json)
+        except Exception as e:
+            logger.error(
+                f"Gemini insight generation or validation failed. Response text: {getattr(response, 'text', 'No response text available')}",
+                exc_info=True,
+            )
+            raise ValueError(
+                "Failed to generate valid insights from AI response."
+            ) from e
+
 
 # Singleton instance
 ai_service = AIService()
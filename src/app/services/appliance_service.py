@@ -11,6 +11,7 @@ from typing import Optional, List
 from datetime import datetime, timezone
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.app.db.session import after_commit
 from src.app.crud.appliance_crud import appliance_repository
 from src.app.crud.bill_crud import bill_repository
 from src.app.crud.user_crud import user_repository
@@ -28,7 +29,7 @@ from src.app.schemas.appliance_schema import (
     ApplianceCatalogCreate,
 )
 from src.app.core.exception_utils import raise_for_status
-from src.app.services.cache_service import cache_service
+from src.app.services.cache_service import cache_service, bill_tag, user_tag
 from src.app.core.exceptions import (
     ResourceNotFound,
     NotAuthorized,
@@ -82,6 +83,11 @@ class ApplianceService:
             detail=f"You are not authorized to {action} this appliance.",
         )
 
+    @staticmethod
+    def _appliance_cache_tags(appliance: UserApplianceDetailedResponse) -> list:
+        """Cache tags for an appliance: dropped together with its bill."""
+        return [bill_tag(appliance.bill_id), user_tag(appliance.user_id)]
+
     async def _load_appliance_schema_from_db(
         self, *, db: AsyncSession, appliance_id: uuid.UUID
     ) -> Optional[UserApplianceDetailedResponse]:
@@ -99,6 +105,18 @@ class ApplianceService:
         )
         return UserApplianceDetailedResponse.model_validate(appliance_model)
 
+    async def _load_appliance_schemas_from_db(
+        self, *, db: AsyncSession, appliance_ids: List[uuid.UUID]
+    ) -> List[UserApplianceDetailedResponse]:
+        """Bulk loader for the cache: one query for every appliance missing from it."""
+        appliances = await self.appliance_repository.get_many(
+            db=db, ids=appliance_ids
+        )
+        return [
+            UserApplianceDetailedResponse.model_validate(appliance)
+            for appliance in appliances
+        ]
+
     async def get_appliance_by_id(
         self, db: AsyncSession, *, current_user: User, appliance_id: uuid.UUID
     ) -> Optional[UserApplianceDetailedResponse]:
@@ -110,6 +128,7 @@ class ApplianceService:
             loader=lambda: self._load_appliance_schema_from_db(
                 db=db, appliance_id=appliance_id
             ),
+            tags=self._appliance_cache_tags,
             ttl=300,  # Cache for 5 minutes
         )
 
@@ -129,6 +148,44 @@ class ApplianceService:
         )
         return appliance
 
+    async def get_appliance_json_by_id(
+        self, db: AsyncSession, *, current_user: User, appliance_id: uuid.UUID
+    ) -> str:
+        """
+        Same as get_appliance_by_id, but returns the cached JSON untouched so
+        the endpoint can send it as-is. Cache hits skip model validation entirely.
+        """
+        cached = await cache_service.get_or_set_json(
+            schema_type=UserApplianceDetailedResponse,
+            obj_id=appliance_id,
+            loader=lambda: self._load_appliance_schema_from_db(
+                db=db, appliance_id=appliance_id
+            ),
+            tags=self._appliance_cache_tags,
+            ttl=300,  # Cache for 5 minutes
+        )
+
+        # Fine-grained authorization check
+        if current_user.is_admin:
+            return cached.payload
+        owner = cached.owner
+        if owner is None:
+            # Entry written without an owner; fall back to reading the payload.
+            owner = UserApplianceDetailedResponse.model_validate_json(
+                cached.payload
+            ).user_id
+
+        raise_for_status(
+            condition=(str(current_user.id) != str(owner)),
+            exception=NotAuthorized,
+            detail="You are not authorized to view this appliance.",
+        )
+
+        self._logger.debug(
+            f"Appliance {appliance_id} retrieved by user {current_user.id}"
+        )
+        return cached.payload
+
     async def get_user_appliances(
         self,
         db: AsyncSession,
@@ -136,6 +193,7 @@ class ApplianceService:
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
     ) -> UserApplianceListResponse:
@@ -147,6 +205,7 @@ class ApplianceService:
             current_user: User making the request
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor (overrides skip)
             filters: Optional filters to apply
             order_by: Field to order by
             order_desc: Whether to order in descending order
@@ -173,23 +232,30 @@ class ApplianceService:
         if limit <= 0 or limit > 100:
             raise ValidationError("Limit must be between 1 and 100")
 
-        # Delegate fetching to the repository
-        appliances, total = await self.appliance_repository.get_by_user(
+        # Fetch only the page of IDs, then hydrate from the cache in one
+        # round trip and bulk-load whatever is missing.
+        page = await self.appliance_repository.get_ids_by_user(
             db=db,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             user_id=user_id,
             order_by=order_by,
             order_desc=order_desc,
         )
-
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
+        appliances = await cache_service.get_or_load_many(
+            schema_type=UserApplianceDetailedResponse,
+            ids=page.items,
+            loader=lambda missing: self._load_appliance_schemas_from_db(
+                db=db, appliance_ids=missing
+            ),
+            tags=self._appliance_cache_tags,
+            ttl=300,  # Cache for 5 minutes
+        )
 
         # Construct the response schema
         response = UserApplianceListResponse(
-            items=appliances, total=total, page=page, pages=total_pages, size=limit
+            items=appliances, **page.meta(skip=skip, limit=limit, cursor=cursor)
         )
 
         return response
@@ -202,6 +268,7 @@ class ApplianceService:
         bill_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
     ) -> UserApplianceListResponse:
@@ -213,6 +280,7 @@ class ApplianceService:
             current_user: User making the request
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor (overrides skip)
             filters: Optional filters to apply
             order_by: Field to order by
             order_desc: Whether to order in descending order
@@ -225,16 +293,18 @@ class ApplianceService:
             ValidationError: If pagination parameters are invalid
         """
         # Authorization check: admins can list all users
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with id {user_id} not Found",
             resource_type="Bill",
         )
         user = await self.user_repository.get(db=db, obj_id=user_id)
 
-        if user.id != bill.user_id:
+        if user.id != bill_owner_id:
             raise NotAuthorized("only administrators can access this")
 
         # Input validation
@@ -244,22 +314,19 @@ class ApplianceService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        appliances, total = await self.appliance_repository.get_by_bills(
+        page = await self.appliance_repository.get_by_bills(
             db=db,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             bill_id=bill_id,
             order_by=order_by,
             order_desc=order_desc,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = UserApplianceListResponse(
-            items=appliances, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.meta(skip=skip, limit=limit, cursor=cursor)
         )
 
         return response
@@ -273,15 +340,17 @@ class ApplianceService:
         appliance_in: UserApplianceCreate,
     ) -> UserAppliance:
         """create a new appliance"""
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
 
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to add an appliance to this bill."
             )
@@ -315,7 +384,9 @@ class ApplianceService:
         new_appliance = await self.appliance_repository.create(
             db=db, obj_in=appliance_to_create
         )
-        await db.refresh(new_appliance)
+
+        # The bill detail embeds its appliances
+        after_commit(db, lambda: cache_service.invalidate_tag(bill_tag(bill_id)))
 
         self._logger.info(f"New appliance created: {new_appliance.custom_name}")
 
@@ -332,15 +403,17 @@ class ApplianceService:
     ) -> UserAppliance:
         """update an existing appliance"""
 
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
 
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to add an appliance to this bill."
             )
@@ -374,7 +447,10 @@ class ApplianceService:
             db=db, appliance=appliance_to_update, fields_to_update=update_dict
         )
 
-        await cache_service.invalidate(UserAppliance, appliance_id)
+        # Drops the appliance itself and the bill detail that embeds it
+        after_commit(
+            db, lambda: cache_service.invalidate_tag(bill_tag(appliance_to_update.bill_id))
+        )
 
         self._logger.info(
             f"Appliance {appliance_id} updated by {current_user.id}",
@@ -396,15 +472,17 @@ class ApplianceService:
     ) -> None:
         """Delete an appliance by it's ID"""
 
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
 
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to add an appliance to this bill."
             )
@@ -426,7 +504,7 @@ class ApplianceService:
             action="delete",
         )
 
-        if str(appliance_to_delete.bill_id) != str(bill.id):
+        if str(appliance_to_delete.bill_id) != str(bill_id):
             raise NotAuthorized(
                 f"Appliance {appliance_id} does not belong to bill {bill_id}."
             )
@@ -435,21 +513,15 @@ class ApplianceService:
             f"Deleting estimates associated with appliance {appliance_id}"
         )
 
-        estimates_to_delete = (
-            await self.appliance_repository.get_estimate_by_appliance_id(
-                db=db, appliance_id=appliance_id
-            )
-        )
-
-        await self.appliance_repository.delete_estimate(
-            db=db, estimate_id=estimates_to_delete.id
+        await self.appliance_repository.delete_estimates_by_appliance(
+            db=db, appliance_id=appliance_id
         )
 
-        # 4. Perform the deletion
+        # 4. Perform the deletion (committed together with the estimates)
         await self.appliance_repository.delete(db=db, obj_id=appliance_id)
 
-        # 5. Clean up cache and tokens
-        await cache_service.invalidate(UserAppliance, appliance_id)
+        # 5. Drop the appliance and the bill detail that embeds it
+        after_commit(db, lambda: cache_service.invalidate_tag(bill_tag(bill_id)))
 
         self._logger.warning(
             f"Appliance {appliance_id} permanently deleted by {current_user.id}",
@@ -464,15 +536,17 @@ class ApplianceService:
         self, db: AsyncSession, *, current_user: User, bill_id: uuid.UUID
     ) -> List[ApplianceEstimate]:
         """Get all estimates for a bill"""
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
         if (
-            str(bill.user_id) != str(current_user.id)
+            str(bill_owner_id) != str(current_user.id)
             and current_user.role != UserRole.ADMIN
         ):
             raise NotAuthorized(
@@ -520,7 +594,6 @@ class ApplianceService:
         new_catalog = await self.appliance_repository.create_catalog(
             db=db, catalog_in=appliance_to_create
         )
-        await db.refresh(new_catalog)
 
         self._logger.info(f"new_catalog created: {new_catalog.label}")
 
@@ -4,6 +4,7 @@ Authentication service module.
 Handles user authentication, registration, and token management.
 """
 
+import asyncio
 import logging
 import uuid
 from typing import Dict
@@ -28,6 +29,7 @@ from src.app.tasks.email_tasks import (
 )
 
 from src.app.services.cache_service import cache_service
+from src.app.db.session import after_commit, db as database
 from src.app.core.exception_utils import raise_for_status
 from src.app.core.exceptions import (
     ResourceAlreadyExists,
@@ -54,6 +56,7 @@ class AuthService:
     def __init__(self):
         self.user_repository = user_repository
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._hash_upgrades: Dict[uuid.UUID, asyncio.Task] = {}
 
     def create_token_pair(self, *, user: User) -> TokenResponse:
         """
@@ -83,7 +86,7 @@ class AuthService:
         user = await user_repository.get_by_email(db=db, email=email)
 
         # 3. Verify the user and password
-        password_is_valid = user and password_manager.verify_password(
+        password_is_valid = user and await password_manager.verify_password_async(
             password, user.hashed_password
         )
 
@@ -101,13 +104,12 @@ class AuthService:
         # 5. On successful login, clear any previous failed attempts
         await rate_limit_service.clear_failed_auth_attempts(client_ip)
 
-        # 6. Check if the password needs to be re-hashed with stronger parameters
-        if password_manager.upgrade_hash_if_needed(password, user.hashed_password):
-            user.hashed_password = password_manager.hash_password(password)
-            db.add(user)
-            await db.commit()
-            await cache_service.invalidate(User, user.id)
-            logger.info(f"Password re-hashed for user {user.id}")
+        # 6. Re-hash with stronger parameters if needed. needs_rehash only
+        # parses the hash; the new hash is computed after the response.
+        if password_manager.needs_rehash(user.hashed_password):
+            self._schedule_hash_upgrade(
+                user_id=user.id, password=password, old_hash=user.hashed_password
+            )
 
         # Use the helper to create the token pair
         token_response = self.create_token_pair(user=user)
@@ -115,6 +117,40 @@ class AuthService:
         logger.info(f"User {user.id} logged in successfully.")
         return token_response
 
+    def _schedule_hash_upgrade(
+        self, *, user_id: uuid.UUID, password: str, old_hash: str
+    ) -> None:
+        """Re-hash a user's password in the background (at most once per user)."""
+        if user_id in self._hash_upgrades:
+            return
+        task = asyncio.create_task(
+            self._upgrade_password_hash(
+                user_id=user_id, password=password, old_hash=old_hash
+            )
+        )
+        self._hash_upgrades[user_id] = task
+        task.add_done_callback(lambda _: self._hash_upgrades.pop(user_id, None))
+
+    async def _upgrade_password_hash(
+        self, *, user_id: uuid.UUID, password: str, old_hash: str
+    ) -> None:
+        """Store a stronger hash, unless the password changed in the meantime."""
+        try:
+            new_hash = await password_manager.hash_password_async(password)
+            async with database.session_context() as session:
+                replaced = await self.user_repository.replace_password_hash(
+                    session, user_id=user_id, old_hash=old_hash, new_hash=new_hash
+                )
+            if not replaced:
+                return
+            await cache_service.invalidate(User, user_id)
+            self._logger.info(f"Password re-hashed for user {user_id}")
+        except Exception:
+            # The old hash keeps working; we try again on the next login.
+            self._logger.warning(
+                f"Password re-hash failed for user {user_id}", exc_info=True
+            )
+
     async def refresh_token(
         self, db: AsyncSession, *, refresh_token: str
     ) -> TokenResponse:
@@ -167,7 +203,7 @@ class AuthService:
             user=user,
             fields_to_update={"tokens_valid_from_utc": datetime.now(timezone.utc)},
         )
-        await cache_service.invalidate(User, user.id)
+        after_commit(db, lambda: cache_service.invalidate(User, user.id))
         self._logger.info(f"All tokens revoked for user {user.id}")
 
     # =========PASSWORD===========
@@ -178,13 +214,15 @@ class AuthService:
         Allows an authenticated user to change their own password.
         """
         # 1. Verify the user's current password is correct.
-        if not password_manager.verify_password(
+        if not await password_manager.verify_password_async(
             password_data.current_password, user.hashed_password
         ):
             raise InvalidCredentials(detail="Incorrect current password.")
 
         # 2. Hash the new password.
-        new_hashed_password = password_manager.hash_password(password_data.new_password)
+        new_hashed_password = await password_manager.hash_password_async(
+            password_data.new_password
+        )
 
         # 3. Update the password in the database.
         await user_repository.update(
@@ -260,7 +298,9 @@ class AuthService:
             raise InvalidToken(detail="Invalid token or user is inactive.")
 
         # 3. Hash the new password
-        new_hashed_password = password_manager.hash_password(reset_data.new_password)
+        new_hashed_password = await password_manager.hash_password_async(
+            reset_data.new_password
+        )
 
         # 4. Update the user's password using the correct repository method
         await self.user_repository.update(
@@ -355,7 +395,7 @@ class AuthService:
             db, user=user, fields_to_update={"is_verified": True}
         )
 
-        await cache_service.invalidate(User, user.id)
+        after_commit(db, lambda: cache_service.invalidate(User, user.id))
 
         logger.info(f"Email successfully verified for user {user.first_name}")
         return verified_user
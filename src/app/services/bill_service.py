@@ -7,16 +7,15 @@ handling authorization, validation, and orchestrating repository calls.
 """
 import uuid
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import date
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.app.crud.user_crud import user_repository
-from src.app.crud.bill_crud import bill_repository
+from src.app.crud.bill_crud import BillLoad, bill_repository
 from src.app.schemas.bill_schema import (
     BillDetailedResponse,
     BillListResponse,
-    BillResponse,
     BillUserListResponse,
     BillUploadResponse,
     BillConfirmRequest,
@@ -27,7 +26,8 @@ from src.app.models.user_model import User, UserRole
 
 from src.app.services.s3_service import s3_service
 
-from src.app.services.cache_service import cache_service
+from src.app.services.cache_service import cache_service, bill_tag, user_tag
+from src.app.db.session import after_commit, db as database
 from src.app.core.exception_utils import raise_for_status
 from src.app.core.exceptions import (
     ResourceNotFound,
@@ -80,13 +80,18 @@ class BillService:
             detail=f"You are not authorized to {action} this bill.",
         )
 
+    @staticmethod
+    def _bill_cache_tags(bill: BillDetailedResponse) -> list:
+        """Cache tags for a bill: dropped when the bill or its appliances change."""
+        return [bill_tag(bill.id), user_tag(bill.user_id)]
+
     async def _load_bill_schema_from_db(
         self, *, db: AsyncSession, bill_id: uuid.UUID
     ) -> Optional[BillDetailedResponse]:
         """Private helper to load a user from the DB and convert it to a Pydantic schema.
         This is our "loader" function for the cache."""
 
-        bill_model = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_model = await self.bill_repository.get(db=db, obj_id=bill_id)
         raise_for_status(
             condition=bill_model is None,
             exception=ResourceNotFound,
@@ -95,6 +100,21 @@ class BillService:
         )
         return BillDetailedResponse.model_validate(bill_model)
 
+    async def _load_bill_schemas_from_db(
+        self, *, db: AsyncSession, bill_ids: List[uuid.UUID]
+    ) -> List[BillDetailedResponse]:
+        """Bulk loader for the cache: one query for every bill missing from it."""
+        bills = await self.bill_repository.get_many(db=db, ids=bill_ids)
+        return [BillDetailedResponse.model_validate(bill) for bill in bills]
+
+    async def _refresh_bill_schema(
+        self, *, bill_id: uuid.UUID
+    ) -> Optional[BillDetailedResponse]:
+        """Background refresher for the bill cache. Runs after the request that
+        scheduled it has finished, so it opens its own session."""
+        async with database.session_context() as session:
+            return await self._load_bill_schema_from_db(db=session, bill_id=bill_id)
+
     async def get_bill_by_id(
         self, db: AsyncSession, *, bill_id: uuid.UUID, current_user: User
     ) -> Optional[BillDetailedResponse]:
@@ -104,6 +124,8 @@ class BillService:
             schema_type=BillDetailedResponse,
             obj_id=bill_id,
             loader=lambda: self._load_bill_schema_from_db(db=db, bill_id=bill_id),
+            refresher=lambda: self._refresh_bill_schema(bill_id=bill_id),
+            tags=self._bill_cache_tags,
             ttl=300,  # Cache for 5 minutes
         )
 
@@ -121,6 +143,39 @@ class BillService:
         self._logger.debug(f"Bill {bill_id} retrieved by user {current_user.id}")
         return bill
 
+    async def get_bill_json_by_id(
+        self, db: AsyncSession, *, bill_id: uuid.UUID, current_user: User
+    ) -> str:
+        """
+        Same as get_bill_by_id, but returns the cached JSON untouched so the
+        endpoint can send it as-is. Cache hits skip model validation entirely.
+        """
+        cached = await cache_service.get_or_set_json(
+            schema_type=BillDetailedResponse,
+            obj_id=bill_id,
+            loader=lambda: self._load_bill_schema_from_db(db=db, bill_id=bill_id),
+            refresher=lambda: self._refresh_bill_schema(bill_id=bill_id),
+            tags=self._bill_cache_tags,
+            ttl=300,  # Cache for 5 minutes
+        )
+
+        # Fine-grained authorization check
+        if current_user.is_admin:
+            return cached.payload
+        owner = cached.owner
+        if owner is None:
+            # Entry written without an owner; fall back to reading the payload.
+            owner = BillDetailedResponse.model_validate_json(cached.payload).user_id
+
+        raise_for_status(
+            condition=(str(current_user.id) != str(owner)),
+            exception=NotAuthorized,
+            detail="You are not authorized to view this bill.",
+        )
+
+        self._logger.debug(f"Bill {bill_id} retrieved by user {current_user.id}")
+        return cached.payload
+
     async def get_user_bills(
         self,
         db: AsyncSession,
@@ -128,6 +183,7 @@ class BillService:
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
@@ -140,6 +196,7 @@ class BillService:
             current_user: User making the request
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor (overrides skip)
             filters: Optional filters to apply
             order_by: Field to order by
             order_desc: Whether to order in descending order
@@ -167,22 +224,19 @@ class BillService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        bills, total = await self.bill_repository.get_all(
+        page = await self.bill_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = BillListResponse(
-            items=bills, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.meta(skip=skip, limit=limit, cursor=cursor)
         )
 
         return response
@@ -194,6 +248,7 @@ class BillService:
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
@@ -206,6 +261,7 @@ class BillService:
             current_user: User making the request
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor (overrides skip)
             filters: Optional filters to apply
             order_by: Field to order by
             order_desc: Whether to order in descending order
@@ -233,24 +289,31 @@ class BillService:
         if limit <= 0 or limit > 100:
             raise ValidationError("Limit must be between 1 and 100")
 
-        # Delegate fetching to the repository
-        bills, total = await self.bill_repository.get_my_bills(
+        # Fetch only the page of IDs, then hydrate from the cache in one
+        # round trip and bulk-load whatever is missing.
+        page = await self.bill_repository.get_my_bill_ids(
             db=db,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             filters=filters,
             user_id=user_id,
             order_by=order_by,
             order_desc=order_desc,
         )
-
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
+        bills = await cache_service.get_or_load_many(
+            schema_type=BillDetailedResponse,
+            ids=page.items,
+            loader=lambda missing: self._load_bill_schemas_from_db(
+                db=db, bill_ids=missing
+            ),
+            tags=self._bill_cache_tags,
+            ttl=300,  # Cache for 5 minutes
+        )
 
         # Construct the response schema
         response = BillUserListResponse(
-            items=bills, total=total, page=page, pages=total_pages, size=limit
+            items=bills, **page.meta(skip=skip, limit=limit, cursor=cursor)
         )
 
         return response
@@ -288,7 +351,7 @@ class BillService:
         new_bill = await self.bill_repository.create(db=db, bill_data=bill_obj)
 
         # Trigger the parsing task
-        parse_digital_pdf_task.delay(bill_id=str(new_bill.id))
+        after_commit(db, lambda: parse_digital_pdf_task.delay(bill_id=str(new_bill.id)))
 
         logger.info(
             f"PDF bill processing queued for user {user.id}, bill_id: {new_bill.id}"
@@ -303,7 +366,9 @@ class BillService:
         This is an internal method called by the system, not a user.
         """
         # 1. Fetch the existing placeholder bill object
-        bill_to_update = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_to_update = await self.bill_repository.get(
+            db=db, obj_id=bill_id, load=BillLoad.SUMMARY
+        )
         if not bill_to_update:
             # This should ideally not happen if the task was triggered correctly
             logger.error(f"Cannot update non-existent bill with ID: {bill_id}")
@@ -326,8 +391,10 @@ class BillService:
             db=db, bill=bill_to_update, fields_to_update=update_data
         )
 
-        # 4.Invalidate the cache for this bill
-        await cache_service.invalidate(BillResponse, updated_bill.id)
+        # 4.Invalidate everything cached for this bill
+        after_commit(
+            db, lambda: cache_service.invalidate_tag(bill_tag(updated_bill.id))
+        )
 
         self._logger.info(f"Successfully parsed and updated bill: {bill_id}")
 
@@ -339,7 +406,7 @@ class BillService:
         """Deleted a bill by it's ID"""
 
         bill_to_delete = await self.bill_repository.get(
-            db=db, bill_id=bill_id_to_delete
+            db=db, obj_id=bill_id_to_delete, load=BillLoad.SUMMARY
         )
 
         raise_for_status(
@@ -355,10 +422,12 @@ class BillService:
         )
 
         # 4. Perform the deletion
-        await self.bill_repository.delete(db=db, bill_id=bill_to_delete)
+        await self.bill_repository.delete(db=db, bill_id=bill_id_to_delete)
 
-        # 5. Clean up cache and tokens
-        await cache_service.invalidate(User, bill_id_to_delete)
+        # 5. Clean up everything cached for this bill
+        after_commit(
+            db, lambda: cache_service.invalidate_tag(bill_tag(bill_id_to_delete))
+        )
 
         self._logger.warning(
             f"Bill {bill_id_to_delete} permanently deleted by {current_user.id}",
@@ -372,16 +441,18 @@ class BillService:
         self, db: AsyncSession, *, bill_id: uuid.UUID, current_user: User
     ) -> None:
         """Triggers the appliance estimation task for a specific bill after an auth check."""
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with id {bill_id} is not found.",
             resource_type="Bill",
         )
 
         # Authorization check
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to trigger estimation for this bill."
             )
@@ -1,4 +1,11 @@
+import asyncio
+import json
 import logging
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
 from typing import (
     Any,
     Awaitable,
@@ -6,6 +13,7 @@ from typing import (
     Dict,
     Iterable,
     List,
+    NamedTuple,
     Optional,
     Tuple,
     Type,
@@ -15,12 +23,322 @@ from typing import (
 
 from pydantic import BaseModel
 
-from app.db.redis_conn import redis_client
+from app.core.config import settings
+from app.db.redis_conn import redis_binary_client as redis_client
+from src.app.core.exceptions import ResourceNotFound
+
+# Optional codec backends; only needed when a schema is configured to use them.
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# Tags are either a fixed list or derived from the object being cached.
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+# Stored values are "<codec id byte><SEP>soft_expires_at,compute_time,owner<SEP><body>".
+# Values that do not start with a known codec id are legacy text entries:
+# either "<SEP>meta<SEP>json" or bare JSON (treated as fresh until Redis
+# expires them), so old and new entries can be read side by side.
+_META_SEP = "\x1e"
+_META_SEP_B = b"\x1e"
+
+# Tombstone for a lookup whose loader raised ResourceNotFound; the body is
+# the JSON needed to raise the same error again.
+_TOMBSTONE = 0x00
+_CODEC_JSON = 0x01
+_CODEC_ZSTD = 0x02
+_CODEC_LZ4 = 0x03
+_CODEC_MSGPACK = 0x04
+
+# Register ARGV[1] (a cache key) under every tag set in KEYS, and make sure
+# each tag set lives at least as long as the entry (ARGV[2] seconds).
+_TAG_ADD_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+for _, tag_key in ipairs(KEYS) do
+    redis.call("sadd", tag_key, ARGV[1])
+    if redis.call("ttl", tag_key) < ttl then
+        redis.call("expire", tag_key, ttl)
+    end
+end
+return 1
+"""
+
+# Drop every entry registered under the tag sets in KEYS together with the
+# sets themselves, announce each key on the invalidation channel (ARGV[1])
+# and return the keys. Entry keys are not declared in KEYS, so this assumes a
+# single (non-cluster) Redis, like the rest of this module.
+_TAG_INVALIDATE_SCRIPT = """
+local dropped = {}
+for _, tag_key in ipairs(KEYS) do
+    for _, key in ipairs(redis.call("smembers", tag_key)) do
+        redis.call("del", key)
+        redis.call("publish", ARGV[1], key)
+        dropped[#dropped + 1] = key
+    end
+    redis.call("del", tag_key)
+end
+return dropped
+"""
+
+# Compare-and-delete so a loader only ever releases the lock it acquired.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Metrics bucket for invalidate_tag(), which has no schema type
+TAG_METRICS = "tag_invalidation"
+
+
+class CachedJSON(NamedTuple):
+    """A cached payload exactly as stored, plus the owner id recorded with it."""
+
+    payload: str
+    owner: Optional[str]
+
+
+class _Entry(NamedTuple):
+    payload: str
+    soft_expires_at: Optional[float]
+    compute_time: float
+    owner: Optional[str]
+    tombstone: bool = False
+
+
+class Codec:
+    """
+    Turns the JSON payload of a cache entry into the bytes stored in Redis
+    and back. The base codec stores the JSON unchanged.
+    """
+
+    codec_id = _CODEC_JSON
+
+    def encode(self, payload: bytes) -> Tuple[int, bytes]:
+        """Return (id of the codec actually applied, stored body)."""
+        return self.codec_id, payload
+
+    def decode(self, body: bytes) -> bytes:
+        return body
+
+
+class ZstdCodec(Codec):
+    """zstd-compresses payloads of at least min_size bytes."""
+
+    codec_id = _CODEC_ZSTD
+
+    def __init__(self, min_size: int = 1024, level: int = 3):
+        if zstandard is None:
+            raise RuntimeError("The zstd cache codec requires the 'zstandard' package.")
+        self.min_size = int(min_size)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, payload: bytes) -> Tuple[int, bytes]:
+        if len(payload) < self.min_size:
+            return _CODEC_JSON, payload
+        return self.codec_id, self._compressor.compress(payload)
+
+    def decode(self, body: bytes) -> bytes:
+        return self._decompressor.decompress(body)
+
+
+class Lz4Codec(Codec):
+    """lz4-compresses payloads of at least min_size bytes."""
+
+    codec_id = _CODEC_LZ4
+
+    def __init__(self, min_size: int = 1024):
+        if lz4_frame is None:
+            raise RuntimeError("The lz4 cache codec requires the 'lz4' package.")
+        self.min_size = int(min_size)
+
+    def encode(self, payload: bytes) -> Tuple[int, bytes]:
+        if len(payload) < self.min_size:
+            return _CODEC_JSON, payload
+        return self.codec_id, lz4_frame.compress(payload)
+
+    def decode(self, body: bytes) -> bytes:
+        return lz4_frame.decompress(body)
+
+
+class MsgpackCodec(Codec):
+    """
+    Stores payloads as msgpack. Smaller than JSON for number-heavy schemas,
+    at the cost of converting back to JSON on every read.
+    """
+
+    codec_id = _CODEC_MSGPACK
+
+    def __init__(self, min_size: int = 0):
+        if msgpack is None:
+            raise RuntimeError("The msgpack cache codec requires the 'msgpack' package.")
+        self.min_size = int(min_size)
+
+    def encode(self, payload: bytes) -> Tuple[int, bytes]:
+        if len(payload) < self.min_size:
+            return _CODEC_JSON, payload
+        return self.codec_id, msgpack.packb(json.loads(payload))
+
+    def decode(self, body: bytes) -> bytes:
+        data = msgpack.unpackb(body)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+_CODECS: Dict[str, Type[Codec]] = {
+    "json": Codec,
+    "zstd": ZstdCodec,
+    "lz4": Lz4Codec,
+    "msgpack": MsgpackCodec,
+}
+_CODECS_BY_ID: Dict[int, Type[Codec]] = {c.codec_id: c for c in _CODECS.values()}
+
+
+def build_codec(name: str, min_size: int = 1024) -> Codec:
+    """Build a codec from its config name ("json", "zstd", "lz4", "msgpack")."""
+    try:
+        codec_cls = _CODECS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown cache codec: {name!r}") from None
+    if codec_cls is Codec:
+        return Codec()
+    return codec_cls(min_size=min_size)
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU used as the L1 tier in front of Redis.
+
+    Entries carry their own expiry (monotonic clock) and the store is capped
+    both by entry count and by the total size of the cached payloads. The
+    least recently used entries are evicted first once either cap is hit.
+    """
+
+    __slots__ = ("max_entries", "max_bytes", "_data", "_bytes")
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        # key -> (expires_at, size, payload)
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, _, payload = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._data.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: Any, ttl: float) -> None:
+        self.delete(key)
+        size = len(payload)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        self._data[key] = (time.monotonic() + ttl, size, payload)
+        self._bytes += size
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+
+class SchemaMetrics:
+    """
+    Counters for one cached schema. Times are in seconds, sizes in bytes.
+
+    hits/misses count lookups (a stale entry served while it refreshes is a
+    hit and a stale_hit; one reloaded in the foreground is a miss), and
+    bytes_written is the stored size after the codec.
+    """
+
+    __slots__ = (
+        "hits",
+        "l1_hits",
+        "misses",
+        "stale_hits",
+        "negative_hits",
+        "negative_stores",
+        "loader_calls",
+        "loader_errors",
+        "loader_seconds",
+        "loader_max_seconds",
+        "writes",
+        "bytes_written",
+        "max_bytes_written",
+        "serialize_seconds",
+        "deserializations",
+        "deserialize_seconds",
+        "validation_errors",
+        "type_errors",
+        "redis_errors",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def record_loader(self, seconds: float, calls: int = 1) -> None:
+        self.loader_calls += calls
+        self.loader_seconds += seconds
+        if seconds > self.loader_max_seconds:
+            self.loader_max_seconds = seconds
+
+    def record_write(self, size: int) -> None:
+        self.writes += 1
+        self.bytes_written += size
+        if size > self.max_bytes_written:
+            self.max_bytes_written = size
+
+    def snapshot(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: getattr(self, name) for name in self.__slots__}
+        lookups = self.hits + self.negative_hits + self.misses
+        data["hit_ratio"] = (
+            round((self.hits + self.negative_hits) / lookups, 4) if lookups else None
+        )
+        data["avg_loader_ms"] = (
+            round(self.loader_seconds * 1000 / self.loader_calls, 3)
+            if self.loader_calls
+            else None
+        )
+        data["avg_bytes_written"] = (
+            self.bytes_written // self.writes if self.writes else None
+        )
+        return data
+
 
 class CacheService:
     """
@@ -32,11 +350,38 @@ class CacheService:
     - Namespace and version prefixing for clean segmentation and bulk invalidation.
     - Per-model TTL overrides.
     - get_or_set convenience to fetch on miss and populate the cache.
+    - Optional in-process L1 tier (LRU + short TTL) in front of Redis, kept
+      coherent across workers through a Redis pub/sub invalidation channel.
+    - Single-flight get_or_set: concurrent misses for the same key share one
+      loader call in-process, and a short Redis lock elects a single loader
+      across processes while the others wait for the fill.
+    - Soft TTL + stale-while-revalidate: entries carry a soft expiry inside the
+      hard Redis TTL. Reads past it (or picked early by XFetch-style
+      probabilistic expiration) serve the stale value and refresh it in the
+      background when a refresher is supplied.
+    - Batch get_many / set_many / get_or_load_many: one MGET (or one pipeline)
+      per page of ids, and a single bulk loader call for the misses.
+    - Tag-based invalidation: entries can be stored with tags such as
+      "bill:{id}" or "user:{id}" (Redis sets of keys), and invalidate_tag()
+      drops every dependent entry in a single round trip.
+    - get_or_set_json: hits cost one GET and return the stored JSON untouched,
+      together with the owner id (owner_field) recorded at write time, so
+      endpoints can authorize and respond without validating the model.
+    - Pluggable codec per schema (zstd / lz4 above a size threshold, or
+      msgpack). Every value carries the id of the codec that wrote it, so
+      changing codecs never breaks entries that are already cached.
+    - Negative caching: when a loader raises ResourceNotFound a short-lived
+      tombstone is stored and the same error is raised from cache until it
+      expires or a real value is written/invalidated under that key.
+    - Per-schema metrics (hits, misses, loader calls/latency, payload sizes,
+      (de)serialization time, Redis errors); see metrics_snapshot().
 
     Notes:
     - We only cache schemas (never raw SQLAlchemy models) for security and speed.
     - Cached instances are ready-to-serialize API responses, or you can return the JSON
       directly if your handler prefers that.
+    - The L1 tier is only consulted while the invalidation listener is running
+      (see start()), so processes that never subscribe always read from Redis.
     """
 
     def __init__(
@@ -51,6 +396,21 @@ class CacheService:
         dump_by_alias: bool = False,
         dump_exclude_none: bool = False,
         validate_strict: bool = False,
+        local_cache: bool = False,
+        local_max_entries: int = 10_000,
+        local_max_bytes: int = 32 * 1024 * 1024,
+        local_ttl: float = 5.0,
+        local_ttl_overrides: Optional[Dict[Union[Type[BaseModel], str], float]] = None,
+        invalidation_channel: str = "cache:invalidate",
+        lock_timeout: float = 10.0,
+        lock_wait_timeout: float = 5.0,
+        lock_poll_interval: float = 0.05,
+        soft_ttl_ratio: float = 0.8,
+        xfetch_beta: float = 1.0,
+        owner_field: Optional[str] = "user_id",
+        codec: Optional[Codec] = None,
+        codec_overrides: Optional[Dict[Union[Type[BaseModel], str], Codec]] = None,
+        negative_ttl: int = 30,
     ):
         self.default_ttl = int(ttl)
         self.namespace = namespace
@@ -61,12 +421,298 @@ class CacheService:
         self.dump_by_alias = dump_by_alias
         self.dump_exclude_none = dump_exclude_none
         self.validate_strict = validate_strict
+        self.owner_field = owner_field
+
+        # Negative caching (0 disables tombstones)
+        self.negative_ttl = int(negative_ttl)
+
+        # Per-schema metrics, keyed by schema name
+        self._metrics: Dict[str, SchemaMetrics] = {}
+
+        # Storage codecs
+        self.codec = codec or Codec()
+        self.codec_overrides = codec_overrides or {}
+        self._decoders: Dict[int, Codec] = {self.codec.codec_id: self.codec}
+        for override in self.codec_overrides.values():
+            self._decoders.setdefault(override.codec_id, override)
+
+        # L1 (in-process) tier
+        self.local_default_ttl = float(local_ttl)
+        self.local_ttl_overrides = local_ttl_overrides or {}
+        self.invalidation_channel = invalidation_channel
+        self._local: Optional[LocalCache] = (
+            LocalCache(local_max_entries, local_max_bytes) if local_cache else None
+        )
+        self._listener_task: Optional[asyncio.Task] = None
+        self._subscribed = False
+
+        # Stampede protection
+        self.lock_timeout = float(lock_timeout)
+        self.lock_wait_timeout = float(lock_wait_timeout)
+        self.lock_poll_interval = float(lock_poll_interval)
+        self._inflight: Dict[str, "asyncio.Future[Optional[_Entry]]"] = {}
+        self._release_lock = redis_client.register_script(_RELEASE_LOCK_SCRIPT)
+
+        # Tag-based invalidation
+        self._tag_add = redis_client.register_script(_TAG_ADD_SCRIPT)
+        self._tag_invalidate = redis_client.register_script(_TAG_INVALIDATE_SCRIPT)
+
+        # Stale-while-revalidate
+        self.soft_ttl_ratio = float(soft_ttl_ratio)
+        self.xfetch_beta = float(xfetch_beta)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # Invalidations seen per key while its refresh is in flight
+        self._generations: Dict[str, int] = {}
 
     # ---------- TTL helpers ----------
 
     def _ttl_for(self, schema_type: Type[SchemaType]) -> int:
         return int(self.ttl_overrides.get(schema_type, self.default_ttl))
 
+    def _local_ttl_for(self, schema_type: Type[SchemaType], redis_ttl: int) -> float:
+        ttl = self.local_ttl_overrides.get(schema_type)
+        if ttl is None:
+            ttl = self.local_ttl_overrides.get(
+                self._schema_name(schema_type), self.local_default_ttl
+            )
+        # Never let L1 outlive the Redis entry it mirrors.
+        return min(float(ttl), float(redis_ttl))
+
+    def _soft_ttl_for(self, hard_ttl: int, soft_ttl: Optional[int]) -> float:
+        if soft_ttl is not None:
+            return min(float(soft_ttl), float(hard_ttl))
+        return hard_ttl * self.soft_ttl_ratio
+
+    # ---------- Envelope + codecs ----------
+
+    def _codec_for(self, schema_type: Type[SchemaType]) -> Codec:
+        codec = self.codec_overrides.get(schema_type)
+        if codec is None:
+            codec = self.codec_overrides.get(self._schema_name(schema_type), self.codec)
+        return codec
+
+    def _decoder_for(self, codec_id: int) -> Codec:
+        codec = self._decoders.get(codec_id)
+        if codec is None:
+            # Written by a process configured with another codec.
+            codec = _CODECS_BY_ID[codec_id]()
+            self._decoders[codec_id] = codec
+        return codec
+
+    def _wrap(
+        self,
+        schema_type: Type[SchemaType],
+        payload: str,
+        soft_expires_at: float,
+        compute_time: float,
+        owner: Optional[str] = None,
+    ) -> bytes:
+        codec_id, body = self._codec_for(schema_type).encode(payload.encode("utf-8"))
+        meta = f"{soft_expires_at:.3f},{compute_time:.4f},{owner or ''}"
+        stored = b"".join(
+            (bytes((codec_id,)), _META_SEP_B, meta.encode("ascii"), _META_SEP_B, body)
+        )
+        self._metrics_for(schema_type).record_write(len(stored))
+        return stored
+
+    def _unwrap(self, raw: Union[bytes, str]) -> _Entry:
+        """Split a stored value into its (decoded) payload and envelope fields."""
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        if raw[0] == _TOMBSTONE:
+            return _Entry(raw[2:].decode("utf-8"), None, 0.0, None, True)
+        if raw[0] in _CODECS_BY_ID:
+            end = raw.index(_META_SEP_B, 2)
+            meta = raw[2:end].decode("ascii").split(",")
+            body = self._decoder_for(raw[0]).decode(raw[end + 1 :])
+            return _Entry(
+                body.decode("utf-8"), float(meta[0]), float(meta[1]), meta[2] or None
+            )
+
+        # Legacy text entries
+        text = raw.decode("utf-8")
+        if not text.startswith(_META_SEP):
+            return _Entry(text, None, 0.0, None)
+        end = text.index(_META_SEP, 1)
+        meta = text[1:end].split(",")
+        owner = meta[2] if len(meta) > 2 and meta[2] else None
+        return _Entry(text[end + 1 :], float(meta[0]), float(meta[1]), owner)
+
+    def _owner_of(self, obj: Any) -> Optional[str]:
+        if not self.owner_field:
+            return None
+        owner = getattr(obj, self.owner_field, None)
+        return str(owner) if owner is not None else None
+
+    # ---------- Negative caching ----------
+
+    def _tombstone_for(self, exc: ResourceNotFound) -> bytes:
+        body = json.dumps(
+            {
+                "resource_type": exc.context.get("resource_type"),
+                "resource_id": exc.context.get("resource_id"),
+                "detail": exc.detail,
+            }
+        )
+        return b"".join((bytes((_TOMBSTONE,)), _META_SEP_B, body.encode("utf-8")))
+
+    def _raise_tombstone(self, schema_type: Type[SchemaType], entry: _Entry) -> None:
+        self._metrics_for(schema_type).negative_hits += 1
+        raise ResourceNotFound(**json.loads(entry.payload))
+
+    async def _store_tombstone(
+        self, schema_type: Type[SchemaType], key: str, exc: ResourceNotFound
+    ) -> None:
+        if self.negative_ttl <= 0:
+            return
+        stored = self._tombstone_for(exc)
+        try:
+            await redis_client.set(key, stored, ex=self.negative_ttl)
+        except Exception:
+            self._metrics_for(schema_type).redis_errors += 1
+            logger.warning("Failed to cache tombstone for key: %s", key, exc_info=True)
+            return
+        if self._local_active:
+            self._local.set(
+                key, stored, self._local_ttl_for(schema_type, self.negative_ttl)
+            )
+        self._metrics_for(schema_type).negative_stores += 1
+
+    # ---------- Metrics ----------
+
+    def _metrics_for(self, schema_type: Type[SchemaType]) -> SchemaMetrics:
+        return self._metrics_named(self._schema_name(schema_type))
+
+    def _metrics_named(self, name: str) -> SchemaMetrics:
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = self._metrics[name] = SchemaMetrics()
+        return metrics
+
+    def metrics_snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-schema counters for this process, keyed by lowercased schema name,
+        plus derived hit_ratio / avg_loader_ms / avg_bytes_written. Tag
+        invalidations aren't tied to a schema and count under
+        "tag_invalidation". With reset
+        the counters start over, e.g. to diff two snapshots.
+        """
+        snapshot = {
+            name: metrics.snapshot() for name, metrics in sorted(self._metrics.items())
+        }
+        if reset:
+            self._metrics.clear()
+        return snapshot
+
+    def _decode_model(self, schema_type: Type[SchemaType], payload: str) -> SchemaType:
+        metrics = self._metrics_for(schema_type)
+        started = time.perf_counter()
+        try:
+            return schema_type.model_validate_json(payload, strict=self.validate_strict)
+        except Exception:
+            metrics.validation_errors += 1
+            raise
+        finally:
+            metrics.deserializations += 1
+            metrics.deserialize_seconds += time.perf_counter() - started
+
+    def _check_type(self, schema_type: Type[SchemaType], obj: Any, source: str) -> None:
+        # A loader producing another type means the entry is cached under the
+        # wrong schema (and key prefix); count it so it shows up in metrics.
+        if not isinstance(obj, schema_type):
+            self._metrics_for(schema_type).type_errors += 1
+            raise TypeError(
+                f"{source} returned {type(obj).__name__}, expected {schema_type.__name__}"
+            )
+
+    def _should_refresh(
+        self, soft_expires_at: Optional[float], compute_time: float
+    ) -> bool:
+        """
+        XFetch: the closer an entry is to its soft expiry, and the more
+        expensive it was to compute, the likelier a reader is picked to
+        refresh it early. Past the soft expiry this is always True.
+        """
+        if soft_expires_at is None:
+            return False
+        jitter = -compute_time * self.xfetch_beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= soft_expires_at
+
+    # ---------- L1 helpers ----------
+
+    @property
+    def _local_active(self) -> bool:
+        return self._local is not None and self._subscribed
+
+    async def _read_raw(
+        self, schema_type: Type[SchemaType], key: str
+    ) -> Optional[bytes]:
+        """Read the stored value for key, consulting L1 before Redis."""
+        if self._local_active:
+            cached = self._local.get(key)
+            if cached is not None:
+                self._metrics_for(schema_type).l1_hits += 1
+                return cached
+
+        if not self._local_active:
+            cached = await redis_client.get(key)
+            return cached or None
+
+        # Fetch the remaining TTL in the same round trip so L1 never
+        # outlives the Redis copy.
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.ttl(key)
+            cached, ttl = await pipe.execute()
+        if not cached:
+            return None
+        if ttl and ttl > 0:
+            self._local.set(key, cached, self._local_ttl_for(schema_type, ttl))
+        return cached
+
+    async def _read_raw_many(
+        self, schema_type: Type[SchemaType], keys: List[str]
+    ) -> List[Optional[bytes]]:
+        """Batch version of _read_raw: L1 first, then one Redis round trip."""
+        results: List[Optional[bytes]] = [None] * len(keys)
+        pending: List[int] = []
+        for i, key in enumerate(keys):
+            cached = self._local.get(key) if self._local_active else None
+            if cached is not None:
+                self._metrics_for(schema_type).l1_hits += 1
+                results[i] = cached
+            else:
+                pending.append(i)
+        if not pending:
+            return results
+
+        pending_keys = [keys[i] for i in pending]
+        if not self._local_active:
+            values = await redis_client.mget(pending_keys)
+            ttls: List[int] = [0] * len(pending_keys)
+        else:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.mget(pending_keys)
+                for key in pending_keys:
+                    pipe.ttl(key)
+                values, *ttls = await pipe.execute()
+
+        for i, key, cached, ttl in zip(pending, pending_keys, values, ttls):
+            if not cached:
+                continue
+            results[i] = cached
+            if self._local_active and ttl and ttl > 0:
+                self._local.set(key, cached, self._local_ttl_for(schema_type, ttl))
+        return results
+
+    async def _lookup(
+        self, schema_type: Type[SchemaType], key: str
+    ) -> Optional[_Entry]:
+        raw = await self._read_raw(schema_type, key)
+        if not raw:
+            return None
+        return self._unwrap(raw)
+
     # ---------- PK + key helpers ----------
 
     def _schema_name(self, schema_type: Type[SchemaType]) -> str:
@@ -188,6 +834,22 @@ class CacheService:
         values = self._pk_values_from_identifier(schema_type, obj_id)
         return self._key_from_values(schema_type, values)
 
+    def _tag_key(self, tag: str) -> str:
+        parts: List[str] = []
+        if self.namespace:
+            parts.append(self.namespace)
+        if self.version:
+            parts.append(f"v{self.version}")
+        parts.append(f"tag:{tag}")
+        return ":".join(parts)
+
+    def _resolve_tags(self, tags: Optional[Tags], obj: Any) -> List[str]:
+        if tags is None:
+            return []
+        if callable(tags):
+            tags = tags(obj)
+        return [self._tag_key(tag) for tag in tags]
+
     # ---------- Public API ----------
 
     async def get(
@@ -203,20 +865,39 @@ class CacheService:
           - dict {pk_name: value}.
         """
         key = self._key_for_id(schema_type, obj_id)
+        metrics = self._metrics_for(schema_type)
         try:
-            cached = await redis_client.get(key)
-            if not cached:
-                return None
-            if isinstance(cached, bytes):
-                cached = cached.decode("utf-8")
-            return schema_type.model_validate_json(cached, strict=self.validate_strict)
+            entry = await self._lookup(schema_type, key)
         except Exception:
+            metrics.redis_errors += 1
             logger.warning("Cache lookup failed for key: %s", key, exc_info=True)
             return None
+        if entry is None or entry.tombstone:
+            metrics.misses += 1
+            return None
+        try:
+            obj = self._decode_model(schema_type, entry.payload)
+        except Exception:
+            metrics.misses += 1
+            logger.warning(
+                "Cached payload failed validation for key: %s", key, exc_info=True
+            )
+            return None
+        metrics.hits += 1
+        return obj
 
-    async def set(self, obj: SchemaType, *, ttl: Optional[int] = None) -> None:
+    async def set(
+        self,
+        obj: SchemaType,
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> None:
         """
         Cache a schema instance. Uses configured PK fields to build the key.
+        soft_ttl defaults to soft_ttl_ratio of the hard TTL. tags (e.g.
+        ["bill:<id>", "user:<id>"]) register the entry for invalidate_tag().
         """
         try:
             key = self._key_for_obj(obj)
@@ -229,15 +910,62 @@ class CacheService:
             return
 
         try:
-            payload = obj.model_dump_json(
-                by_alias=self.dump_by_alias, exclude_none=self.dump_exclude_none
-            )
-            await redis_client.set(
-                key, payload, ex=int(ttl or self._ttl_for(type(obj)))
+            await self._store(
+                type(obj),
+                key,
+                self._dump(obj),
+                ttl=ttl,
+                soft_ttl=soft_ttl,
+                tags=self._resolve_tags(tags, obj),
+                owner=self._owner_of(obj),
+                publish=True,
             )
         except Exception:
+            self._metrics_for(type(obj)).redis_errors += 1
             logger.warning("Failed to cache object with key: %s", key, exc_info=True)
 
+    def _dump(self, obj: SchemaType) -> str:
+        started = time.perf_counter()
+        payload = obj.model_dump_json(
+            by_alias=self.dump_by_alias, exclude_none=self.dump_exclude_none
+        )
+        self._metrics_for(type(obj)).serialize_seconds += time.perf_counter() - started
+        return payload
+
+    async def _store(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        payload: str,
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        compute_time: float = 0.0,
+        tags: Optional[List[str]] = None,
+        owner: Optional[str] = None,
+        publish: bool = False,
+    ) -> None:
+        """
+        Write one entry. publish=True announces the key on the invalidation
+        channel so other workers drop the value they hold in L1; needed
+        whenever this may overwrite an existing entry.
+        """
+        ex = int(ttl or self._ttl_for(schema_type))
+        soft_expires_at = time.time() + self._soft_ttl_for(ex, soft_ttl)
+        stored = self._wrap(schema_type, payload, soft_expires_at, compute_time, owner)
+        if tags or publish:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, stored, ex=ex)
+                if tags:
+                    await self._tag_add(keys=tags, args=[key, ex], client=pipe)
+                if publish:
+                    pipe.publish(self.invalidation_channel, key)
+                await pipe.execute()
+        else:
+            await redis_client.set(key, stored, ex=ex)
+        if self._local_active:
+            self._local.set(key, stored, self._local_ttl_for(schema_type, ex))
+
     async def invalidate(
         self,
         schema_type: Type[SchemaType],
@@ -247,11 +975,96 @@ class CacheService:
         Invalidate a single cached entry.
         """
         key = self._key_for_id(schema_type, obj_id)
+        self._bump_generation(key)
+        if self._local is not None:
+            self._local.delete(key)
         try:
             await redis_client.delete(key)
+            # Tell every other worker to drop its L1 copy as well.
+            await redis_client.publish(self.invalidation_channel, key)
         except Exception:
+            self._metrics_for(schema_type).redis_errors += 1
             logger.warning("Failed to invalidate cache for key: %s", key, exc_info=True)
 
+    async def invalidate_tag(self, *tags: str) -> None:
+        """
+        Invalidate every entry stored under any of the given tags, e.g.
+        invalidate_tag("bill:<id>") after a bill or one of its appliances changes.
+        """
+        if not tags:
+            return
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        try:
+            dropped = await self._tag_invalidate(
+                keys=tag_keys, args=[self.invalidation_channel]
+            )
+        except Exception:
+            self._metrics_named(TAG_METRICS).redis_errors += 1
+            logger.warning("Failed to invalidate cache tags: %s", tags, exc_info=True)
+            return
+        for key in dropped:
+            key = key.decode("utf-8") if isinstance(key, bytes) else key
+            self._bump_generation(key)
+            if self._local is not None:
+                self._local.delete(key)
+
+    async def get_with(
+        self,
+        schema_type: Type[SchemaType],
+        obj_id: Union[Any, Tuple[Any, ...], List[Any], Dict[str, Any]],
+        commands: Callable[[Any], None],
+    ) -> Tuple[Optional[SchemaType], List[Any]]:
+        """
+        Like get(), but first queues commands(pipe) on the same pipeline so
+        unrelated reads share the round trip. Returns (instance or None,
+        results of the extra commands in order). Entries due for refresh
+        count as misses so the caller reloads them through get_or_set.
+
+        The extra commands run on the binary client (values come back as
+        bytes). Redis errors propagate so callers can fall back.
+        """
+        key = self._key_for_id(schema_type, obj_id)
+        metrics = self._metrics_for(schema_type)
+        cached = self._local.get(key) if self._local_active else None
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                commands(pipe)
+                if cached is None:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                results = await pipe.execute()
+        except Exception:
+            metrics.redis_errors += 1
+            raise
+
+        if cached is not None:
+            metrics.l1_hits += 1
+        else:
+            cached, ttl = results[-2:]
+            results = results[:-2]
+            if cached and self._local_active and ttl and ttl > 0:
+                self._local.set(key, cached, self._local_ttl_for(schema_type, ttl))
+
+        if not cached:
+            metrics.misses += 1
+            return None, results
+        try:
+            entry = self._unwrap(cached)
+            if entry.tombstone or self._should_refresh(
+                entry.soft_expires_at, entry.compute_time
+            ):
+                metrics.misses += 1
+                return None, results
+            obj = self._decode_model(schema_type, entry.payload)
+        except Exception:
+            metrics.misses += 1
+            logger.warning(
+                "Cached payload failed validation for key: %s", key, exc_info=True
+            )
+            return None, results
+        metrics.hits += 1
+        return obj, results
+
     async def get_json(
         self,
         schema_type: Type[SchemaType],
@@ -261,14 +1074,18 @@ class CacheService:
         Retrieve the raw JSON string (useful if your endpoint returns JSON directly).
         """
         key = self._key_for_id(schema_type, obj_id)
+        metrics = self._metrics_for(schema_type)
         try:
-            cached = await redis_client.get(key)
-            if not cached:
-                return None
-            return cached.decode("utf-8") if isinstance(cached, bytes) else cached
+            entry = await self._lookup(schema_type, key)
         except Exception:
+            metrics.redis_errors += 1
             logger.warning("Cache lookup (raw) failed for key: %s", key, exc_info=True)
             return None
+        if entry is None or entry.tombstone:
+            metrics.misses += 1
+            return None
+        metrics.hits += 1
+        return entry.payload
 
     async def get_or_set(
         self,
@@ -277,32 +1094,701 @@ class CacheService:
         loader: Callable[[], Awaitable[Optional[SchemaType]]],
         *,
         ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
         return_json: bool = False,
+        refresher: Optional[Callable[[], Awaitable[Optional[SchemaType]]]] = None,
+        tags: Optional[Tags] = None,
     ) -> Optional[Union[SchemaType, str]]:
         """
         Fetch from cache; on miss, await loader(), cache the result, and return it.
         Optionally return the cached JSON string instead of a model.
+
+        Concurrent misses for the same key are coalesced: within a process they
+        share one in-flight load, across processes a Redis lock makes sure only
+        one loader runs per key per expiry.
+
+        Entries past their soft TTL (or picked early by XFetch) are refreshed:
+        - with a refresher, the stale value is returned immediately and
+          refresher() repopulates the entry in the background. It must not
+          depend on request-scoped resources (e.g. open its own DB session).
+        - without one, the caller reloads synchronously through loader().
         """
-        # 1) Try cache
-        cached_model = await self.get(schema_type, obj_id)
-        if cached_model is not None:
-            if return_json:
-                return await self.get_json(schema_type, obj_id)
-            return cached_model
-
-        # 2) Load on miss
-        obj = await loader()
-        if obj is None:
+        obj, entry = await self._get_or_load(
+            schema_type,
+            obj_id,
+            loader,
+            ttl=ttl,
+            soft_ttl=soft_ttl,
+            refresher=refresher,
+            tags=tags,
+            decode=not return_json,
+        )
+        if entry is None:
             return None
+        return entry.payload if return_json else obj
 
-        # Validate type (defensive)
-        if not isinstance(obj, schema_type):
-            raise TypeError(
-                f"Loader returned {type(obj).__name__}, expected {schema_type.__name__}"
+    async def get_or_set_json(
+        self,
+        schema_type: Type[SchemaType],
+        obj_id: Union[Any, Tuple[Any, ...], List[Any], Dict[str, Any]],
+        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        refresher: Optional[Callable[[], Awaitable[Optional[SchemaType]]]] = None,
+        tags: Optional[Tags] = None,
+    ) -> Optional[CachedJSON]:
+        """
+        Like get_or_set, but returns the stored JSON as-is. A hit is a single
+        GET with no model validation; the owner recorded from owner_field at
+        write time comes along for authorization checks.
+        """
+        _, entry = await self._get_or_load(
+            schema_type,
+            obj_id,
+            loader,
+            ttl=ttl,
+            soft_ttl=soft_ttl,
+            refresher=refresher,
+            tags=tags,
+            decode=False,
+        )
+        if entry is None:
+            return None
+        return CachedJSON(entry.payload, entry.owner)
+
+    async def _get_or_load(
+        self,
+        schema_type: Type[SchemaType],
+        obj_id: Union[Any, Tuple[Any, ...], List[Any], Dict[str, Any]],
+        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        refresher: Optional[Callable[[], Awaitable[Optional[SchemaType]]]] = None,
+        tags: Optional[Tags] = None,
+        decode: bool = True,
+    ) -> Tuple[Optional[SchemaType], Optional[_Entry]]:
+        """
+        Shared body of get_or_set / get_or_set_json. Returns (model, entry);
+        entry is None when nothing was found, model is only guaranteed when
+        decode is set.
+        """
+        key = self._key_for_id(schema_type, obj_id)
+        metrics = self._metrics_for(schema_type)
+
+        # 1) Try cache
+        try:
+            entry = await self._lookup(schema_type, key)
+        except Exception:
+            metrics.redis_errors += 1
+            logger.warning("Cache lookup failed for key: %s", key, exc_info=True)
+            entry = None
+
+        if entry is not None and entry.tombstone:
+            self._raise_tombstone(schema_type, entry)
+
+        if entry is not None:
+            stale = self._should_refresh(entry.soft_expires_at, entry.compute_time)
+            if stale and refresher is not None:
+                self._schedule_refresh(
+                    schema_type, key, refresher, ttl=ttl, soft_ttl=soft_ttl, tags=tags
+                )
+            if not stale or refresher is not None:
+                try:
+                    obj = (
+                        self._decode_model(schema_type, entry.payload)
+                        if decode
+                        else None
+                    )
+                except Exception:
+                    logger.warning(
+                        "Cached payload failed validation for key: %s",
+                        key,
+                        exc_info=True,
+                    )
+                else:
+                    metrics.hits += 1
+                    if stale:
+                        metrics.stale_hits += 1
+                    return obj, entry
+
+        # 2) Load on miss, coalescing concurrent misses for the same key
+        metrics.misses += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Someone in this process is already loading; share their result.
+            # Waiters get their own instance, never the leader's object.
+            try:
+                entry = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leader's request went away mid-load; try again ourselves.
+                return await self._get_or_load(
+                    schema_type,
+                    obj_id,
+                    loader,
+                    ttl=ttl,
+                    soft_ttl=soft_ttl,
+                    refresher=refresher,
+                    tags=tags,
+                    decode=decode,
+                )
+            if entry is None or not decode:
+                return None, entry
+            return self._decode_model(schema_type, entry.payload), entry
+
+        future: "asyncio.Future[Optional[_Entry]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        # Nobody may be waiting; retrieve the exception so it is never "lost".
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            obj, entry = await self._load_single_flight(
+                schema_type,
+                key,
+                loader,
+                ttl=ttl,
+                soft_ttl=soft_ttl,
+                tags=tags,
+                decode=decode,
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(entry)
+        finally:
+            self._inflight.pop(key, None)
+
+        return obj, entry
+
+    async def get_many(
+        self,
+        schema_type: Type[SchemaType],
+        ids: Iterable[Union[Any, Tuple[Any, ...], List[Any]]],
+    ) -> Dict[Any, SchemaType]:
+        """
+        Retrieve many cached instances with a single MGET.
+        Returns {obj_id: instance} for the hits only; ids must be hashable
+        (scalars, or tuples for composite keys).
+        """
+        ids = list(ids)
+        if not ids:
+            return {}
+        keys = [self._key_for_id(schema_type, obj_id) for obj_id in ids]
+        metrics = self._metrics_for(schema_type)
+        try:
+            raws = await self._read_raw_many(schema_type, keys)
+        except Exception:
+            metrics.redis_errors += 1
+            logger.warning(
+                "Cache batch lookup failed for %s", schema_type.__name__, exc_info=True
+            )
+            return {}
+
+        found: Dict[Any, SchemaType] = {}
+        for obj_id, key, raw in zip(ids, keys, raws):
+            if not raw:
+                continue
+            try:
+                entry = self._unwrap(raw)
+                if entry.tombstone:
+                    continue
+                found[obj_id] = self._decode_model(schema_type, entry.payload)
+            except Exception:
+                logger.warning(
+                    "Cached payload failed validation for key: %s", key, exc_info=True
+                )
+        metrics.hits += len(found)
+        metrics.misses += len(ids) - len(found)
+        return found
+
+    async def set_many(
+        self,
+        objs: Iterable[SchemaType],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> None:
+        """
+        Cache many schema instances with one pipelined round of SET EX.
+        A callable tags is evaluated per object.
+        """
+        entries: List[Tuple[Type[SchemaType], str, str, List[str], Optional[str]]] = []
+        for obj in objs:
+            try:
+                entries.append(
+                    (
+                        type(obj),
+                        self._key_for_obj(obj),
+                        self._dump(obj),
+                        self._resolve_tags(tags, obj),
+                        self._owner_of(obj),
+                    )
+                )
+            except Exception:
+                logger.warning(
+                    "Attempted to cache object of type %s but could not derive key.",
+                    type(obj).__name__,
+                    exc_info=True,
+                )
+        if not entries:
+            return
+
+        try:
+            await self._store_many(entries, ttl=ttl, soft_ttl=soft_ttl, publish=True)
+        except Exception:
+            for schema_type in {entry[0] for entry in entries}:
+                self._metrics_for(schema_type).redis_errors += 1
+            logger.warning("Failed to cache %d objects", len(entries), exc_info=True)
+
+    async def _store_many(
+        self,
+        entries: List[Tuple[Type[SchemaType], str, str, List[str], Optional[str]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        compute_time: float = 0.0,
+        publish: bool = False,
+    ) -> None:
+        """Pipelined _store() for many entries; see there for publish."""
+        now = time.time()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for schema_type, key, payload, tags, owner in entries:
+                ex = int(ttl or self._ttl_for(schema_type))
+                stored = self._wrap(
+                    schema_type,
+                    payload,
+                    now + self._soft_ttl_for(ex, soft_ttl),
+                    compute_time,
+                    owner,
+                )
+                pipe.set(key, stored, ex=ex)
+                if tags:
+                    await self._tag_add(keys=tags, args=[key, ex], client=pipe)
+                if publish:
+                    pipe.publish(self.invalidation_channel, key)
+                if self._local_active:
+                    self._local.set(key, stored, self._local_ttl_for(schema_type, ex))
+            await pipe.execute()
+
+    async def get_or_load_many(
+        self,
+        schema_type: Type[SchemaType],
+        ids: Iterable[Union[Any, Tuple[Any, ...], List[Any]]],
+        loader: Callable[[List[Any]], Awaitable[Iterable[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> List[SchemaType]:
+        """
+        Batch get_or_set. Reads every id with one MGET, then awaits
+        loader(missing_ids) once for the misses and caches what it returns.
+
+        Results follow the order of ids; ids the loader did not return are
+        skipped. Entries due for refresh (soft TTL / XFetch) are reloaded in
+        the same loader call rather than in the background.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        keys = [self._key_for_id(schema_type, obj_id) for obj_id in ids]
+        metrics = self._metrics_for(schema_type)
+        try:
+            raws = await self._read_raw_many(schema_type, keys)
+        except Exception:
+            metrics.redis_errors += 1
+            logger.warning(
+                "Cache batch lookup failed for %s", schema_type.__name__, exc_info=True
             )
+            raws = [None] * len(keys)
 
-        await self.set(obj, ttl=ttl)
-        return await self.get_json(schema_type, obj_id) if return_json else obj
+        by_key: Dict[str, SchemaType] = {}
+        missing: List[Any] = []
+        for obj_id, key, raw in zip(ids, keys, raws):
+            if raw:
+                entry = self._unwrap(raw)
+                if entry.tombstone:
+                    # Known to be missing; the loader would not find it either.
+                    metrics.negative_hits += 1
+                    continue
+                if not self._should_refresh(entry.soft_expires_at, entry.compute_time):
+                    try:
+                        by_key[key] = self._decode_model(schema_type, entry.payload)
+                        metrics.hits += 1
+                        continue
+                    except Exception:
+                        logger.warning(
+                            "Cached payload failed validation for key: %s",
+                            key,
+                            exc_info=True,
+                        )
+            missing.append(obj_id)
 
+        if missing:
+            metrics.misses += len(missing)
+            started = time.perf_counter()
+            try:
+                loaded = list(await loader(missing))
+            except Exception:
+                metrics.loader_errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.record_loader(elapsed)
+            compute_time = elapsed / len(missing)
 
-cache_service = CacheService()
+            entries: List[Tuple[Type[SchemaType], str, str, List[str], Optional[str]]] = []
+            for obj in loaded:
+                self._check_type(schema_type, obj, "Loader")
+                key = self._key_for_obj(obj)
+                by_key[key] = obj
+                entries.append(
+                    (
+                        schema_type,
+                        key,
+                        self._dump(obj),
+                        self._resolve_tags(tags, obj),
+                        self._owner_of(obj),
+                    )
+                )
+            if entries:
+                try:
+                    await self._store_many(
+                        entries, ttl=ttl, soft_ttl=soft_ttl, compute_time=compute_time
+                    )
+                except Exception:
+                    metrics.redis_errors += 1
+                    logger.warning(
+                        "Failed to cache %d objects", len(entries), exc_info=True
+                    )
+
+        return [by_key[key] for key in keys if key in by_key]
+
+    async def _load_single_flight(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+        decode: bool = True,
+    ) -> Tuple[Optional[SchemaType], Optional[_Entry]]:
+        """
+        Run loader() for key, making sure only one process does so per expiry.
+
+        A short-lived Redis lock elects the loader. Losers poll the cache until
+        the winner fills it; if the winner fails or the wait times out they
+        fall back to running the loader themselves. Redis problems never block
+        the load, they only disable the coordination. With decode=False a
+        loser returns the winner's raw entry without building a model.
+        """
+        metrics = self._metrics_for(schema_type)
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+        except Exception:
+            metrics.redis_errors += 1
+            logger.warning("Cache lock unavailable for key: %s", key, exc_info=True)
+            acquired = None
+            token = None
+
+        if not acquired and token is not None:
+            entry = await self._wait_for_fill(key, lock_key)
+            if entry is not None and entry.tombstone:
+                self._raise_tombstone(schema_type, entry)
+            if entry is not None:
+                if not decode:
+                    return None, entry
+                return self._decode_model(schema_type, entry.payload), entry
+
+        try:
+            started = time.perf_counter()
+            try:
+                obj = await loader()
+            except ResourceNotFound as exc:
+                metrics.record_loader(time.perf_counter() - started)
+                await self._store_tombstone(schema_type, key, exc)
+                raise
+            except Exception:
+                metrics.record_loader(time.perf_counter() - started)
+                metrics.loader_errors += 1
+                raise
+            compute_time = time.perf_counter() - started
+            metrics.record_loader(compute_time)
+            if obj is None:
+                return None, None
+
+            # Validate type (defensive)
+            self._check_type(schema_type, obj, "Loader")
+
+            entry = _Entry(self._dump(obj), None, compute_time, self._owner_of(obj))
+            try:
+                await self._store(
+                    schema_type,
+                    key,
+                    entry.payload,
+                    ttl=ttl,
+                    soft_ttl=soft_ttl,
+                    compute_time=compute_time,
+                    tags=self._resolve_tags(tags, obj),
+                    owner=entry.owner,
+                )
+            except Exception:
+                metrics.redis_errors += 1
+                logger.warning(
+                    "Failed to cache object with key: %s", key, exc_info=True
+                )
+            return obj, entry
+        finally:
+            if acquired:
+                try:
+                    await self._release_lock(keys=[lock_key], args=[token])
+                except Exception:
+                    metrics.redis_errors += 1
+                    logger.warning(
+                        "Failed to release cache lock: %s", lock_key, exc_info=True
+                    )
+
+    async def _wait_for_fill(self, key: str, lock_key: str) -> Optional[_Entry]:
+        """
+        Wait for the lock holder to populate key. Returns the entry, or None
+        if the lock went away without a value (loader failed or found nothing)
+        or the wait timed out.
+        """
+        deadline = time.monotonic() + self.lock_wait_timeout
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.lock_poll_interval)
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.exists(lock_key)
+                    cached, locked = await pipe.execute()
+                if cached:
+                    return self._unwrap(cached)
+                if not locked:
+                    return None
+        except Exception:
+            logger.warning("Waiting on cache fill failed for key: %s", key, exc_info=True)
+        return None
+
+    def _schedule_refresh(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        refresher: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> None:
+        """Kick off at most one background refresh per key in this process."""
+        if key in self._refreshing:
+            return
+        self._generations[key] = 0
+        task = asyncio.create_task(
+            self._refresh(
+                schema_type, key, refresher, ttl=ttl, soft_ttl=soft_ttl, tags=tags
+            )
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._end_refresh(key))
+
+    def _end_refresh(self, key: str) -> None:
+        self._refreshing.pop(key, None)
+        self._generations.pop(key, None)
+
+    def _bump_generation(self, key: str) -> None:
+        """Record an invalidation so an in-flight refresh of key won't store."""
+        if key in self._generations:
+            self._generations[key] += 1
+
+    def _invalidated_since(self, key: str, generation: int) -> bool:
+        return self._generations.get(key, generation) != generation
+
+    async def _refresh(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        refresher: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> None:
+        """
+        Background revalidation. Shares the single-flight lock with misses, so
+        if another process is already loading this key we simply skip.
+
+        The refresher may read the source before a concurrent write commits.
+        If the key is invalidated while the refresh runs (locally or via the
+        invalidation channel) the result is dropped instead of stored, and
+        dropped again if the invalidation lands while the store is in flight.
+        """
+        metrics = self._metrics_for(schema_type)
+        generation = self._generations.get(key, 0)
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+            if not acquired:
+                return
+        except Exception:
+            metrics.redis_errors += 1
+            logger.warning("Cache lock unavailable for key: %s", key, exc_info=True)
+            return
+
+        try:
+            started = time.perf_counter()
+            try:
+                obj = await refresher()
+            except ResourceNotFound as exc:
+                # Deleted since it was cached: replace the stale value.
+                metrics.record_loader(time.perf_counter() - started)
+                if not self._invalidated_since(key, generation):
+                    await self._store_tombstone(schema_type, key, exc)
+                return
+            except Exception:
+                metrics.record_loader(time.perf_counter() - started)
+                metrics.loader_errors += 1
+                raise
+            compute_time = time.perf_counter() - started
+            metrics.record_loader(compute_time)
+            if obj is None:
+                return
+            self._check_type(schema_type, obj, "Refresher")
+            if self._invalidated_since(key, generation):
+                return
+            await self._store(
+                schema_type,
+                key,
+                self._dump(obj),
+                ttl=ttl,
+                soft_ttl=soft_ttl,
+                compute_time=compute_time,
+                tags=self._resolve_tags(tags, obj),
+                owner=self._owner_of(obj),
+            )
+            if self._invalidated_since(key, generation):
+                # An invalidation raced the write; it may have landed first.
+                await redis_client.delete(key)
+                if self._local is not None:
+                    self._local.delete(key)
+                return
+            # Stop tracking before announcing the overwrite, so our own
+            # message on the invalidation channel doesn't count as one.
+            self._generations.pop(key, None)
+            await redis_client.publish(self.invalidation_channel, key)
+        except Exception:
+            # The stale entry stays until its hard TTL; the next read retries.
+            logger.warning("Background refresh failed for key: %s", key, exc_info=True)
+        finally:
+            try:
+                await self._release_lock(keys=[lock_key], args=[token])
+            except Exception:
+                metrics.redis_errors += 1
+                logger.warning(
+                    "Failed to release cache lock: %s", lock_key, exc_info=True
+                )
+
+    # ---------- L1 invalidation lifecycle ----------
+
+    async def start(self) -> None:
+        """
+        Start listening for cross-worker invalidations. Until this runs (and
+        while the subscription is down) the L1 tier is bypassed entirely.
+        """
+        if self._local is None or self._listener_task is not None:
+            return
+        self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and drop everything held in L1."""
+        for refresh in list(self._refreshing.values()):
+            refresh.cancel()
+        task, self._listener_task = self._listener_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._subscribed = False
+        if self._local is not None:
+            self._local.clear()
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                self._subscribed = True
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    key = message.get("data")
+                    if isinstance(key, bytes):
+                        key = key.decode("utf-8")
+                    self._bump_generation(key)
+                    self._local.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Cache invalidation listener disconnected; retrying.",
+                    exc_info=True,
+                )
+            finally:
+                # Anything could have been invalidated while we were not
+                # listening, so L1 cannot be trusted any more.
+                self._subscribed = False
+                self._local.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(1.0)
+
+
+def bill_tag(bill_id: Any) -> str:
+    """Tag for every cached entry derived from a bill (and its appliances)."""
+    return f"bill:{bill_id}"
+
+
+def user_tag(user_id: Any) -> str:
+    """Tag for every cached entry owned by a user."""
+    return f"user:{user_id}"
+
+
+cache_service = CacheService(
+    # Cached JSON is served verbatim by the raw-JSON endpoints, so it has to
+    # match what FastAPI's response_model serialization would produce.
+    dump_by_alias=True,
+    codec=build_codec(settings.CACHE_CODEC, settings.CACHE_COMPRESSION_MIN_BYTES),
+    codec_overrides={
+        name: build_codec(codec, settings.CACHE_COMPRESSION_MIN_BYTES)
+        for name, codec in settings.CACHE_CODEC_OVERRIDES.items()
+    },
+    negative_ttl=settings.CACHE_NEGATIVE_TTL_SECONDS,
+    local_cache=settings.CACHE_LOCAL_ENABLED,
+    local_max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    local_max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+    local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+    local_ttl_overrides=dict(settings.CACHE_LOCAL_TTL_OVERRIDES),
+    invalidation_channel=settings.CACHE_INVALIDATION_CHANNEL,
+)
@@ -14,7 +14,8 @@ from src.app.tasks.insights_task import generate_insights_task
 from src.app.models.insights_model import Insight, InsightStatus
 from src.app.models.user_model import User, UserRole
 
-from src.app.services.cache_service import cache_service
+from src.app.services.cache_service import cache_service, bill_tag
+from src.app.db.session import after_commit, db as database
 from src.app.core.exception_utils import raise_for_status
 from src.app.core.exceptions import (
     ResourceNotFound,
@@ -67,43 +68,61 @@ class InsightService:
             detail=f"You are not authorized to {action} this insight.",
         )
 
-    async def _load_insight_schema_from_db(
+    async def _load_insight_report_from_db(
         self, *, db: AsyncSession, bill_id: uuid.UUID
     ) -> Optional[InsightResponse]:
-        """Private helper to load a user from the DB and convert it to a Pydantic schema.
-        This is our "loader" function for the cache."""
+        """Loader for the cached insight report. Only completed reports are cached."""
 
-        insight_model = await self.insights_repository.get(db=db, bill_id=bill_id)
+        insight = await self.insights_repository.get_by_bill_id(db=db, bill_id=bill_id)
         raise_for_status(
-            condition=insight_model is None,
+            condition=insight is None,
             exception=ResourceNotFound,
-            detail=f"insight with {bill_id} not Found.",
+            detail=f"Insight for bill {bill_id} not found.",
             resource_type="Insight",
         )
-        return InsightResponse.model_validate(insight_model)
+
+        if insight.status != InsightStatus.COMPLETED:
+            raise ServiceUnavailable(
+                detail=f"Insight generation is still {insight.status.value}. Please check back later.",
+            )
+
+        # Validate the stored JSON against our Pydantic schema and return it
+        return InsightResponse.model_validate(insight.structured_data)
+
+    async def _refresh_insight_report(
+        self, *, bill_id: uuid.UUID
+    ) -> Optional[InsightResponse]:
+        """Background refresher for the insight report cache, on its own session."""
+        async with database.session_context() as session:
+            return await self._load_insight_report_from_db(db=session, bill_id=bill_id)
 
     async def get_by_bill_id(
         self, db: AsyncSession, *, bill_id: uuid.UUID, current_user: User
-    ) -> Optional[Insight]:
+    ) -> Optional[InsightResponse]:
         """get insights by bill_id"""
 
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
 
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to add an appliance to this bill."
             )
 
+        # Same entry as get_insight_report: the schema, not the table model
         insight = await cache_service.get_or_set(
-            schema_type=Insight,
+            schema_type=InsightResponse,
             obj_id=bill_id,
-            loader=lambda: self._load_insight_schema_from_db(db=db, bill_id=bill_id),
+            loader=lambda: self._load_insight_report_from_db(db=db, bill_id=bill_id),
+            refresher=lambda: self._refresh_insight_report(bill_id=bill_id),
+            tags=[bill_tag(bill_id)],
             ttl=300,  # Cache for 5 minutes
         )
 
@@ -120,21 +139,23 @@ class InsightService:
         If not, it creates a 'pending' insight record and triggers the generation task.
         """
         # 1. Authorize: Ensure the user owns the bill they're requesting insights for.
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with the id {bill_id} not Found.",
             resource_type="Bill",
         )
 
-        if bill.user_id != current_user.id and not current_user.role >= UserRole.ADMIN:
+        if bill_owner_id != current_user.id and not current_user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to add an appliance to this bill."
             )
 
         # 2. Check if an insight record already exists.
-        insight = await self.insights_repository.get(db=db, bill_id=bill_id)
+        insight = await self.insights_repository.get_by_bill_id(db=db, bill_id=bill_id)
 
         if insight:
             return InsightStatusResponse(bill_id=bill_id, status=insight.status)
@@ -142,9 +163,13 @@ class InsightService:
         # 3. If no insight exists, create a new one and trigger the task.
         insight_create_schema = InsightCreate(bill_id=bill_id, user_id=current_user.id)
         await self.insights_repository.create(db=db, obj_in=insight_create_schema)
+        # Drop any "not found" tombstone left by an earlier report lookup
+        after_commit(db, lambda: cache_service.invalidate(InsightResponse, bill_id))
 
         # Trigger the Celery task to run in the background
-        generate_insights_task.delay(str(bill_id), str(current_user.id))
+        after_commit(
+            db, lambda: generate_insights_task.delay(str(bill_id), str(current_user.id))
+        )
 
         logger.info(
             f"Insight generation queued for bill {bill_id} by user {current_user.id}"
@@ -157,33 +182,28 @@ class InsightService:
         """
         Securely retrieves the completed insight report for a bill.
         """
-        insight = await self.insights_repository.get(db=db, bill_id=bill_id)
-        raise_for_status(
-            condition=insight is None,
-            exception=ResourceNotFound,
-            detail=f"Insight for bill {bill_id} not found.",
-            resource_type="Insight",
-        )
-
         # ✅ Fetch the bill to validate ownership
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=bill is None,
+            condition=bill_owner_id is None,
             exception=ResourceNotFound,
             detail=f"Bill with id {bill_id} not found.",
             resource_type="Bill",
         )
 
-        if str(bill.user_id) != str(current_user.id) and not current_user.is_admin:
+        if str(bill_owner_id) != str(current_user.id) and not current_user.is_admin:
             raise NotAuthorized("You are not authorized to view this insight report.")
 
-        if insight.status != InsightStatus.COMPLETED:
-            raise ServiceUnavailable(
-                detail=f"Insight generation is still {insight.status.value}. Please check back later.",
-            )
-
-        # Validate the stored JSON against our Pydantic schema and return it
-        return InsightResponse.model_validate(insight.structured_data)
+        return await cache_service.get_or_set(
+            schema_type=InsightResponse,
+            obj_id=bill_id,
+            loader=lambda: self._load_insight_report_from_db(db=db, bill_id=bill_id),
+            refresher=lambda: self._refresh_insight_report(bill_id=bill_id),
+            tags=[bill_tag(bill_id)],
+            ttl=300,  # Cache for 5 minutes
+        )
 
     async def trigger_insight_regeneration(
         self, db: AsyncSession, *, bill_id: uuid.UUID, user: User
@@ -193,45 +213,42 @@ class InsightService:
         Sets the existing insight status back to 'pending'
         """
         # 1. Authorize: Ensure the user owns the bill.
-        bill = await self.bill_repository.get(db=db, bill_id=bill_id)
+        bill_owner_id = await self.bill_repository.get_owner_id(
+            db=db, bill_id=bill_id
+        )
         raise_for_status(
-            condition=(bill is None),
+            condition=(bill_owner_id is None),
             exception=ResourceNotFound,
             detail=f"Bill with id {bill_id} not found",
             resource_type="Bill",
         )
-        if bill.user_id != user.id and not user.role >= UserRole.ADMIN:
+        if bill_owner_id != user.id and not user.role >= UserRole.ADMIN:
             raise NotAuthorized(
                 "You are not authorized to regenerate insights for this bill."
             )
 
-        # 2. Get the existing insight record.
-        insight = await self.insights_repository.get(db=db, bill_id=bill_id)
-        if not insight:
-            # 1. Create the Pydantic instance
-            insight_create = InsightCreate(bill_id=bill_id, user_id=user.id)
-
-            # 2. Convert it to dict for the ORM model
-            insight_dict = insight_create.model_dump()
-            insight_dict["status"] = InsightStatus.PENDING
-            insight_dict["generated_at"] = datetime.now(timezone.utc)
-
-            # 3. Instantiate ORM model
-            insight_to_create = Insight(**insight_dict)
-
-            # 4. Call CRUD create
-            insight = await self.insights_repository.create(
-                db=db, obj_in=insight_to_create
-            )
-        else:
-            # If it does exist, set its status back to pending.
-            insight.status = InsightStatus.PENDING
-            db.add(insight)
-            await db.commit()
-            await db.refresh(insight)
+        # 2. Create the insight record or set it back to pending, in one
+        #    INSERT ... ON CONFLICT (bill_id) statement.
+        [insight] = await self.insights_repository.upsert(
+            db=db,
+            rows=[
+                {
+                    "bill_id": bill_id,
+                    "user_id": user.id,
+                    "status": InsightStatus.PENDING,
+                    "generated_at": datetime.now(timezone.utc),
+                }
+            ],
+            conflict_columns=["bill_id"],
+            update_columns=["status"],
+        )
+        # The old report must not be served while the new one is generated
+        after_commit(db, lambda: cache_service.invalidate(InsightResponse, bill_id))
 
         # 3. Trigger the Celery task to run in the background.
-        generate_insights_task.delay(str(bill_id), str(user.id))
+        after_commit(
+            db, lambda: generate_insights_task.delay(str(bill_id), str(user.id))
+        )
 
         logger.info(
             f"Insight RE-generation queued for bill {bill_id} by user {user.id}"
@@ -1,71 +1,370 @@
 import logging
-from typing import Dict, List
-from datetime import datetime, timedelta
-from collections import defaultdict
+import math
+import time
+from typing import Dict, NamedTuple, Optional
+from collections import OrderedDict
 
+from app.core.config import settings
 from app.db.redis_conn import redis_client
 
 logger = logging.getLogger(__name__)
 
+# GCRA (generic cell rate algorithm) in one round trip. The key holds the
+# "theoretical arrival time" (TAT) in ms; every request pushes it forward by
+# period / limit, and a request is allowed while TAT stays within one period
+# of now. Time comes from the Redis server so workers never disagree, and
+# the key expires together with the TAT so idle identifiers clean up.
+#   KEYS[1] = limiter key, ARGV = limit, period in seconds, cost
+#   returns {limited, remaining, retry_after_ms, reset_after_ms}
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2]) * 1000
+local cost = tonumber(ARGV[3])
+local t = redis.call("time")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = period / limit
+
+local tat = tonumber(redis.call("get", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * cost
+local allow_at = new_tat - period
+
+if now < allow_at then
+    return {1, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+redis.call("set", KEYS[1], string.format("%.3f", new_tat), "PX", math.ceil(new_tat - now))
+return {0, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)}
+"""
+
+# Same GCRA state as above, but takes up to ARGV[3] tokens at once and grants
+# whatever is available (possibly fewer). Used to lease a slice of the quota
+# to one worker.
+#   returns {granted, remaining, retry_after_ms, reset_after_ms}
+_GCRA_LEASE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2]) * 1000
+local requested = tonumber(ARGV[3])
+local t = redis.call("time")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = period / limit
+
+local tat = tonumber(redis.call("get", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local available = math.floor((now + period - tat) / interval)
+local granted = math.min(requested, available)
+
+if granted <= 0 then
+    return {0, 0, math.ceil(tat + interval - period - now), math.ceil(tat - now)}
+end
+
+local new_tat = tat + interval * granted
+redis.call("set", KEYS[1], string.format("%.3f", new_tat), "PX", math.ceil(new_tat - now))
+return {granted, available - granted, 0, math.ceil(new_tat - now)}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of one rate-limit check. Times are in seconds."""
+
+    limited: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+    def headers(self) -> Dict[str, str]:
+        """X-RateLimit-* (and Retry-After when limited) response headers."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if self.limited:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated_at", "full_at")
+
+    def __init__(self, tokens: float, updated_at: float, full_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.full_at = full_at
+
+
+class LocalRateLimiter:
+    """
+    In-process token buckets, one per identifier and window.
+
+    Buckets live in an LRU capped at max_entries, so memory stays bounded no
+    matter how many identifiers show up (e.g. IP-rotating traffic). A bucket
+    left idle long enough to refill completely carries no state, so it is
+    dropped from the LRU head as soon as it is seen there. Every check is O(1).
+
+    Counts are per process. Used alone it is the fallback limiter when there
+    is no Redis; in front of Redis it acts as a pre-filter. A process that
+    has used up a bucket on its own has certainly used up the shared quota
+    too, so those requests are turned away without a round trip.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, _TokenBucket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(
+        self, key: str, capacity: int, window_seconds: int, cost: int = 1
+    ) -> RateLimitResult:
+        """Take cost tokens from key's bucket (capacity per window_seconds)."""
+        now = time.monotonic()
+        rate = capacity / window_seconds
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _TokenBucket(float(capacity), now, now)
+            self._buckets[key] = bucket
+            self._evict(now)
+        else:
+            bucket.tokens = min(
+                float(capacity), bucket.tokens + (now - bucket.updated_at) * rate
+            )
+            bucket.updated_at = now
+            self._buckets.move_to_end(key)
+
+        if bucket.tokens < cost:
+            return RateLimitResult(
+                True,
+                capacity,
+                0,
+                (cost - bucket.tokens) / rate,
+                (capacity - bucket.tokens) / rate,
+            )
+
+        bucket.tokens -= cost
+        bucket.full_at = now + (capacity - bucket.tokens) / rate
+        return RateLimitResult(
+            False,
+            capacity,
+            int(bucket.tokens),
+            0.0,
+            bucket.full_at - now,
+        )
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while len(buckets) > self.max_entries:
+            buckets.popitem(last=False)
+        # Drop a couple of refilled buckets per insert; amortised O(1).
+        for _ in range(2):
+            key, oldest = next(iter(buckets.items()))
+            if oldest.full_at > now or len(buckets) == 1:
+                break
+            del buckets[key]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class _Lease:
+    """Tokens this worker took from the shared quota and has not spent yet."""
+
+    __slots__ = ("tokens", "expires_at", "remaining", "reset_at")
+
+    def __init__(self, tokens: int, expires_at: float, remaining: int, reset_at: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+        # Shared quota left after the lease was taken, for the headers
+        self.remaining = remaining
+        self.reset_at = reset_at
+
 
 class RateLimitService:
     """Handles rate limiting business logic."""
 
     def __init__(self):
-        self.memory_store: Dict[str, List[datetime]] = defaultdict(list)
+        self.local_limiter = LocalRateLimiter(settings.RATE_LIMIT_LOCAL_MAX_ENTRIES)
+        self.local_prefilter = settings.RATE_LIMIT_LOCAL_PREFILTER
         self.use_redis = redis_client is not None
+        self._gcra = (
+            redis_client.register_script(_GCRA_SCRIPT) if self.use_redis else None
+        )
+
+        # Quota leasing (lease_size <= 1 disables it)
+        self.lease_size = settings.RATE_LIMIT_LEASE_SIZE
+        self.lease_ttl = settings.RATE_LIMIT_LEASE_TTL_SECONDS
+        self.max_leases = settings.RATE_LIMIT_LOCAL_MAX_ENTRIES
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._gcra_lease = (
+            redis_client.register_script(_GCRA_LEASE_SCRIPT)
+            if self.use_redis
+            else None
+        )
 
     async def is_rate_limited(
         self, identifier: str, max_requests: int, window_seconds: int
     ) -> bool:
         """Check if identifier is rate limited."""
-        if self.use_redis:
-            return await self._check_redis_rate_limit(
+        result = await self.check_rate_limit(identifier, max_requests, window_seconds)
+        return result.limited
+
+    async def check_rate_limit(
+        self, identifier: str, max_requests: int, window_seconds: int
+    ) -> RateLimitResult:
+        """
+        Count one request for identifier against max_requests per
+        window_seconds and return the verdict with the remaining quota and
+        retry-after.
+        """
+        if not self.use_redis:
+            return self._check_memory_rate_limit(
                 identifier, max_requests, window_seconds
             )
+
+        local = None
+        if self.local_prefilter:
+            local = self._check_memory_rate_limit(
+                identifier, max_requests, window_seconds
+            )
+            if local.limited:
+                return local
+
+        lease_size = self._lease_size_for(max_requests)
+        if lease_size > 1:
+            result = await self._check_leased_rate_limit(
+                identifier, max_requests, window_seconds, lease_size
+            )
         else:
-            return self._check_memory_rate_limit(
+            result = await self._check_redis_rate_limit(
+                identifier, max_requests, window_seconds
+            )
+        if result is None:
+            # Redis is unavailable: the per-process limit still holds.
+            return local or self._check_memory_rate_limit(
                 identifier, max_requests, window_seconds
             )
+        return result
 
     async def _check_redis_rate_limit(
         self, identifier: str, max_requests: int, window_seconds: int
-    ) -> bool:
-        """Redis-based rate limiting."""
+    ) -> Optional[RateLimitResult]:
+        """
+        Redis-based rate limiting (GCRA, one script call per check).
+        Returns None if Redis could not be reached.
+        """
         try:
-            key = f"rate_limit:{identifier}:{window_seconds}"
-            current = await redis_client.incr(key)
-            if current == 1:
-                await redis_client.expire(key, window_seconds)
-            return current > max_requests
+            key = f"rate_limit:gcra:{identifier}:{max_requests}:{window_seconds}"
+            limited, remaining, retry_after_ms, reset_after_ms = await self._gcra(
+                keys=[key], args=[max_requests, window_seconds, 1]
+            )
+            return RateLimitResult(
+                limited=bool(limited),
+                limit=max_requests,
+                remaining=int(remaining),
+                retry_after=int(retry_after_ms) / 1000,
+                reset_after=int(reset_after_ms) / 1000,
+            )
         except Exception:
             logger.error("Redis rate limit check failed.", exc_info=True)
-            return False  # Fail open
+            return None
+
+    def _lease_size_for(self, max_requests: int) -> int:
+        # Never lease more than a quarter of a quota, so a few workers
+        # cannot strand all of it between them (small limits stay exact).
+        return min(self.lease_size, max_requests // 4)
+
+    async def _check_leased_rate_limit(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_seconds: int,
+        lease_size: int,
+    ) -> Optional[RateLimitResult]:
+        """
+        Spend one token from this worker's lease for identifier, taking a
+        new lease of up to lease_size tokens from Redis when it runs out or
+        expires. Tokens left in an expired lease are lost, so the shared
+        limit can undercount by at most one lease per worker.
+        Returns None if Redis could not be reached.
+        """
+        key = f"{identifier}:{max_requests}:{window_seconds}"
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            self._leases.move_to_end(key)
+            return RateLimitResult(
+                False,
+                max_requests,
+                lease.remaining + lease.tokens,
+                0.0,
+                max(lease.reset_at - now, 0.0),
+            )
+
+        try:
+            granted, remaining, retry_after_ms, reset_after_ms = await self._gcra_lease(
+                keys=[f"rate_limit:gcra:{key}"],
+                args=[max_requests, window_seconds, lease_size],
+            )
+        except Exception:
+            logger.error("Redis rate limit lease failed.", exc_info=True)
+            return None
+
+        granted, remaining = int(granted), int(remaining)
+        if granted == 0:
+            self._leases.pop(key, None)
+            return RateLimitResult(
+                True,
+                max_requests,
+                0,
+                int(retry_after_ms) / 1000,
+                int(reset_after_ms) / 1000,
+            )
+
+        lease = _Lease(
+            tokens=granted - 1,
+            expires_at=now + self.lease_ttl,
+            remaining=remaining,
+            reset_at=now + int(reset_after_ms) / 1000,
+        )
+        self._leases[key] = lease
+        self._leases.move_to_end(key)
+        while len(self._leases) > self.max_leases:
+            self._leases.popitem(last=False)
+        return RateLimitResult(
+            False,
+            max_requests,
+            remaining + lease.tokens,
+            0.0,
+            int(reset_after_ms) / 1000,
+        )
 
     def _check_memory_rate_limit(
         self, identifier: str, max_requests: int, window_seconds: int
-    ) -> bool:
-        """Memory-based rate limiting."""
-        now = datetime.now()
-        # Clean old entries
-        self.memory_store[identifier] = [
-            call
-            for call in self.memory_store[identifier]
-            if now - call < timedelta(seconds=window_seconds)
-        ]
-        # Check limit
-        if len(self.memory_store[identifier]) >= max_requests:
-            return True
-        # Record this request
-        self.memory_store[identifier].append(now)
-        return False
+    ) -> RateLimitResult:
+        """Memory-based rate limiting (bounded per-process token buckets)."""
+        return self.local_limiter.check(
+            f"{identifier}:{max_requests}:{window_seconds}",
+            max_requests,
+            window_seconds,
+        )
+
+    @staticmethod
+    def failed_auth_key(identifier: str) -> str:
+        return f"failed_auth:{identifier}"
 
     async def is_auth_rate_limited(
         self, identifier: str, max_attempts: int = 5
     ) -> bool:
         """Check authentication rate limiting."""
         try:
-            key = f"failed_auth:{identifier}"
+            key = self.failed_auth_key(identifier)
             current_attempts = await redis_client.get(key)
             return current_attempts and int(current_attempts) >= max_attempts
         except Exception:
@@ -76,7 +375,7 @@ class RateLimitService:
     ):
         """Record failed authentication attempt."""
         try:
-            key = f"failed_auth:{identifier}"
+            key = self.failed_auth_key(identifier)
             await redis_client.incr(key)
             await redis_client.expire(key, lockout_duration)
         except Exception:
@@ -85,7 +384,7 @@ class RateLimitService:
     async def clear_failed_auth_attempts(self, identifier: str):
         """Clear failed auth attempts on successful login."""
         try:
-            key = f"failed_auth:{identifier}"
+            key = self.failed_auth_key(identifier)
             await redis_client.delete(key)
         except Exception:
             logger.error("Failed to clear auth attempts.", exc_info=True)
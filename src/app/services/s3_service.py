@@ -1,4 +1,5 @@
 # app/services/s3_service.py
+import asyncio
 import logging
 import boto3
 import tempfile
@@ -97,5 +98,10 @@ class S3Service:
             )
 
 
+    async def download_file_async(self, object_key: str) -> str:
+        """download_file on a worker thread, so an event loop isn't blocked."""
+        return await asyncio.to_thread(self.download_file, object_key)
+
+
 # Singleton instance for dependency injection
 s3_service = S3Service()
@@ -12,6 +12,7 @@ import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timezone
 from src.app.crud.user_crud import user_repository
+from src.app.db.session import after_commit
 from src.app.schemas.user_schema import (
     UserUpdate,
     UserListResponse,
@@ -23,7 +24,7 @@ from src.app.models.user_model import User, UserRole
 from src.app.tasks.email_tasks import send_welcome_email_task
 from src.app.services.auth_service import auth_service
 
-from src.app.services.cache_service import cache_service
+from src.app.services.cache_service import cache_service, user_tag
 from src.app.core.exception_utils import raise_for_status
 from src.app.core.exceptions import (
     ResourceNotFound,
@@ -135,6 +136,30 @@ class UserService:
         self._logger.debug(f"User {user_id} retrieved by user {current_user.id}")
         return user
 
+    async def get_user_json_by_id(
+        self, db: AsyncSession, *, user_id: uuid.UUID, current_user: User
+    ) -> str:
+        """
+        Same as get_user_by_id, but returns the cached JSON untouched so the
+        endpoint can send it as-is. Cache hits skip model validation entirely.
+        """
+        # Authorize first: the target is identified by the path, not the payload.
+        raise_for_status(
+            condition=(not current_user.is_admin and current_user.id != user_id),
+            exception=NotAuthorized,
+            detail="You are not authorized to view this user's profile.",
+        )
+
+        cached = await cache_service.get_or_set_json(
+            schema_type=UserResponse,
+            obj_id=user_id,
+            loader=lambda: self._load_user_schema_from_db(db=db, user_id=user_id),
+            ttl=300,  # Cache for 5 minutes
+        )
+
+        self._logger.debug(f"User {user_id} retrieved by user {current_user.id}")
+        return cached.payload
+
     async def get_users(
         self,
         db: AsyncSession,
@@ -142,6 +167,7 @@ class UserService:
         current_user: User,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
@@ -154,6 +180,7 @@ class UserService:
             current_user: User making the request
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor (overrides skip)
             filters: Optional filters to apply
             order_by: Field to order by
             order_desc: Whether to order in descending order
@@ -179,26 +206,23 @@ class UserService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        users, total = await self.user_repository.get_all(
+        page = await self.user_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
+            cursor=cursor,
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = UserListResponse(
-            items=users, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.meta(skip=skip, limit=limit, cursor=cursor)
         )
 
         self._logger.info(
-            f"User list retrieved by {current_user.id}: {len(users)} users returned"
+            f"User list retrieved by {current_user.id}: {len(page.items)} users returned"
         )
         return response
 
@@ -228,7 +252,9 @@ class UserService:
         # 2. Prepare the user model
         user_dict = user_in.model_dump()
         password = user_dict.pop("password")
-        user_dict["hashed_password"] = password_manager.hash_password(password)
+        user_dict["hashed_password"] = await password_manager.hash_password_async(
+            password
+        )
         user_dict["created_at"] = datetime.now(timezone.utc)
         user_dict["updated_at"] = datetime.now(timezone.utc)
 
@@ -238,8 +264,9 @@ class UserService:
         new_user = await self.user_repository.create(db=db, db_obj=user_to_create)
         self._logger.info(f"New user created: {new_user.email}")
 
-        await auth_service.send_verification_email(new_user)
-        await self._send_welcome_email(user=new_user)
+        # No emails for an account whose insert is rolled back
+        after_commit(db, lambda: auth_service.send_verification_email(new_user))
+        after_commit(db, lambda: self._send_welcome_email(user=new_user))
         return new_user
 
     async def update_user(
@@ -279,7 +306,7 @@ class UserService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(User, user_id_to_update)
+        after_commit(db, lambda: cache_service.invalidate(User, user_id_to_update))
 
         self._logger.info(
             f"User {user_id_to_update} updated by {current_user.id}",
@@ -344,7 +371,7 @@ class UserService:
         )
 
         # 6. Invalidate cache and potentially revoke tokens
-        await cache_service.invalidate(User, user_id_to_deactivate)
+        after_commit(db, lambda: cache_service.invalidate(User, user_id_to_deactivate))
         # TODO: Add token revocation logic here
 
         self._logger.info(
@@ -382,7 +409,7 @@ class UserService:
             db=db, user=user_to_activate, fields_to_update={"is_active": True}
         )
 
-        await cache_service.invalidate(User, user_id_to_activate)
+        after_commit(db, lambda: cache_service.invalidate(User, user_id_to_activate))
         self._logger.info(f"User {user_id_to_activate} activated by {current_user.id}")
         return activated_user
 
@@ -413,7 +440,7 @@ class UserService:
             db=db, user=user_to_change, fields_to_update={"role": new_role}
         )
 
-        await cache_service.invalidate(User, user_id_to_change)
+        after_commit(db, lambda: cache_service.invalidate(User, user_id_to_change))
         self._logger.info(
             f"User {user_id_to_change} role changed to {new_role.value} by {current_user.id}"
         )
@@ -464,7 +491,10 @@ class UserService:
         await self.user_repository.delete(db=db, obj_id=user_id_to_delete)
 
         # 5. Clean up cache and tokens
-        await cache_service.invalidate(User, user_id_to_delete)
+        after_commit(db, lambda: cache_service.invalidate(User, user_id_to_delete))
+        after_commit(
+            db, lambda: cache_service.invalidate_tag(user_tag(user_id_to_delete))
+        )
 
         self._logger.warning(
             f"User {user_id_to_delete} permanently deleted by {current_user.id}",
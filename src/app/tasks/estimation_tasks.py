@@ -2,16 +2,15 @@
 
 import logging
 import uuid
-import asyncio
 
-from src.app.core.celery_app import celery_app
 from src.app.crud.appliance_crud import appliance_repository
-from src.app.crud.bill_crud import bill_repository
+from src.app.crud.bill_crud import BillLoad, bill_repository
 from src.app.models.bill_model import Bill
 from src.app.models.appliance_model import ApplianceEstimate
-from src.app.core.config import settings
-from src.app.db.session import Database
+from src.app.db.session import after_commit
+from src.app.services.cache_service import cache_service, bill_tag
 from src.app.tasks.insights_task import generate_insights_task
+from src.app.tasks.runtime import runtime
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +21,7 @@ async def _perform_estimation_for_bill(session, bill: Bill):
     """
     actual_total_kwh = bill.kwh_total
 
-    appliances_for_this_bill, _ = await appliance_repository.get_by_bills(
+    appliances_page = await appliance_repository.get_by_bills(
         db=session,
         bill_id=bill.id,
         skip=0,
@@ -30,6 +29,7 @@ async def _perform_estimation_for_bill(session, bill: Bill):
         order_by="created_at",
         order_desc=True,
     )
+    appliances_for_this_bill = appliances_page.items
 
     if not appliances_for_this_bill:
         logger.info(
@@ -69,7 +69,7 @@ async def _perform_estimation_for_bill(session, bill: Bill):
             ApplianceEstimate.bill_id == bill.id
         )
         await session.execute(delete_statement)
-        await session.commit()
+        after_commit(session, lambda: cache_service.invalidate_tag(bill_tag(bill.id)))
         return
 
     # 3. Calculate the proportional scaling factor
@@ -93,46 +93,41 @@ async def _perform_estimation_for_bill(session, bill: Bill):
         new_estimates.append(
             ApplianceEstimate(
                 bill_id=bill.id,
+                billing_period_start=bill.billing_period_start,
                 user_appliance_id=appliance.id,
                 estimated_kwh=scaled_kwh,
                 estimated_cost=estimated_cost,
             )
         )
 
+    # Old estimates are replaced in the caller's transaction; the cache and
+    # the insights task only see the result once it commits.
     session.add_all(new_estimates)
-    await session.commit()
+    await session.flush()
+    after_commit(session, lambda: cache_service.invalidate_tag(bill_tag(bill.id)))
     logger.info(
         f"Successfully calculated and saved {len(new_estimates)} appliance estimates for bill {bill.id}"
     )
 
     # 6. Trigger the next step in the pipeline (when we build it)
-    generate_insights_task.delay(str(bill.id), str(bill.user_id))
+    after_commit(
+        session, lambda: generate_insights_task.delay(str(bill.id), str(bill.user_id))
+    )
 
 
-@celery_app.task(name="tasks.estimate_appliances_for_bill")
-def estimate_appliances_for_bill_task(bill_id: str):
+@runtime.task(name="tasks.estimate_appliances_for_bill")
+async def estimate_appliances_for_bill_task(bill_id: str):
     """
     Celery task to run estimation for a single bill.
-    This task is self-contained: it creates its own DB connection and async loop.
+    Runs on the worker's shared event loop and database pool (see runtime.py).
     """
     logger.info(f"Worker received task: Estimate appliances for bill_id: {bill_id}")
 
-    # This is our self-contained async entry point
-    async def main():
-        # 1. Create a NEW, LOCAL Database instance for this task run.
-        local_db = Database(str(settings.DATABASE_URL))
-
-        # 2. Connect and get a session from this new local instance.
-        await local_db.connect()
-        async with local_db.session_context() as session:
-            try:
-                bill = await bill_repository.get(db=session, bill_id=uuid.UUID(bill_id))
-                if bill:
-                    # 3. Pass the session to our core logic function.
-                    await _perform_estimation_for_bill(session, bill)
-            finally:
-                # 4. CRITICAL: Always disconnect from the database when done.
-                await local_db.disconnect()
-
-    # 5. Run the self-contained async main function.
-    asyncio.run(main())
+    # 1. Get a session from the worker's long-lived database pool.
+    async with runtime.db.session_context() as session:
+        bill = await bill_repository.get(
+            db=session, obj_id=uuid.UUID(bill_id), load=BillLoad.SUMMARY
+        )
+        if bill:
+            # 2. Pass the session to our core logic function.
+            await _perform_estimation_for_bill(session, bill)
@@ -0,0 +1,25 @@
+# app/tasks/maintenance_tasks.py
+
+import logging
+
+from src.app.db.partitioning import ensure_partitions
+from src.app.tasks.runtime import runtime
+
+logger = logging.getLogger(__name__)
+
+
+@runtime.task(name="tasks.maintain_bill_partitions")
+async def maintain_bill_partitions_task():
+    """
+    Periodic task (celery beat) that creates the coming years' bills and
+    appliance_estimates partitions before any row needs them. Does nothing
+    while bills is not partitioned.
+    """
+    async with runtime.db.session_context() as session:
+        created = await ensure_partitions(session)
+
+    if created:
+        logger.info(f"Bill partition maintenance created {len(created)} partitions")
+    else:
+        logger.info("Bill partition maintenance: nothing to create")
+    return created
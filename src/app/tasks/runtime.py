@@ -0,0 +1,142 @@
+# app/tasks/runtime.py
+import asyncio
+import functools
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from src.app.core.celery_app import celery_app
+from src.app.core.config import settings
+from src.app.db.session import db
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    Long-lived asyncio runtime for one Celery worker process.
+
+    A single event loop runs on a background thread for the lifetime of the
+    process, and the shared database engine (and its connection pool) lives
+    on it. Tasks hand their coroutine to run() instead of calling
+    asyncio.run(), so there is no per-task loop or pool setup, and
+    loop-bound clients (asyncpg, redis.asyncio) stay valid between tasks.
+
+    The runtime starts on worker_process_init (prefork children) or lazily
+    on first use (solo/threads pools, eager mode) and stops on shutdown.
+    At most max_concurrency task coroutines run at once; the rest wait for
+    a slot on the loop.
+    """
+
+    def __init__(self, max_concurrency: int = 32):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.max_concurrency = max(1, max_concurrency)
+        self.db = db
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="celery-async-runtime", daemon=True
+            )
+            thread.start()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._loop, self._thread = loop, thread
+        # Fail fast if the database is unreachable
+        self.run(self.db.connect())
+        logger.info("Worker async runtime started.")
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run coro on the worker loop and block until it finishes."""
+        if self._loop is None:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def _limited(self, coro: Awaitable[T]) -> T:
+        async with self._slots:
+            return await coro
+
+    def task(self, *args: Any, **options: Any) -> Callable:
+        """
+        Register a coroutine function as a Celery task.
+
+        Same arguments as celery_app.task. The registered task is a thin sync
+        wrapper that schedules the coroutine on the worker loop, subject to
+        the concurrency limit, and returns its result.
+        """
+
+        def decorator(fn: Callable[..., Awaitable[T]]):
+            @functools.wraps(fn)
+            def run_task(*task_args: Any, **task_kwargs: Any) -> T:
+                if self._loop is None:
+                    self.start()
+                return self.run(self._limited(fn(*task_args, **task_kwargs)))
+
+            return celery_app.task(*args, **options)(run_task)
+
+        return decorator
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self.db.disconnect(), loop
+                ).result(timeout=10)
+            except Exception:
+                logger.warning("Failed to close the worker DB pool.", exc_info=True)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+            self._loop = self._thread = self._slots = None
+        logger.info("Worker async runtime stopped.")
+
+
+def _task_slots() -> int:
+    """
+    CELERY_ASYNC_CONCURRENCY, capped at what the DB pool can serve at once.
+    Each running task holds a connection, so more slots than pool_size +
+    max_overflow would only queue tasks on the pool until DB_POOL_TIMEOUT.
+    """
+    connections = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if settings.CELERY_ASYNC_CONCURRENCY > connections:
+        logger.warning(
+            f"CELERY_ASYNC_CONCURRENCY={settings.CELERY_ASYNC_CONCURRENCY} exceeds "
+            f"the DB pool ({connections} connections); running {connections} "
+            f"tasks at a time"
+        )
+    return min(settings.CELERY_ASYNC_CONCURRENCY, connections)
+
+
+runtime = WorkerRuntime(max_concurrency=_task_slots())
+
+
+@worker_process_init.connect
+def _start_runtime(**_: Any) -> None:
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_runtime(**_: Any) -> None:
+    runtime.stop()
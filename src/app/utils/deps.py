@@ -1,4 +1,5 @@
 import logging
+import math
 import uuid
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
@@ -23,6 +24,7 @@ from src.app.core.exceptions import (
 )
 from src.app.models.user_model import User, UserRole
 from src.app.services.user_service import UserService
+from src.app.services.cache_service import cache_service
 from src.app.services.rate_limit_service import (
     RateLimitService,
     rate_limit_service as _rate_limit_singleton,
@@ -52,6 +54,22 @@ def get_rate_limit_service() -> RateLimitService:
 
 
 # ================== CORE AUTHENTICATION ==================
+_MAX_FAILED_AUTH_ATTEMPTS = 5
+
+
+async def _raise_if_auth_locked(
+    rate_limit_svc: RateLimitService, client_ip: str, lockout_seconds: int
+) -> None:
+    if await rate_limit_svc.is_auth_rate_limited(
+        client_ip,
+        max_attempts=_MAX_FAILED_AUTH_ATTEMPTS,
+    ):
+        raise RateLimitExceeded(
+            detail="Too many failed authentication attempts.",
+            retry_after=lockout_seconds,
+        )
+
+
 async def _authenticate_user_from_token(
     request: Request,
     db: AsyncSession,
@@ -64,22 +82,13 @@ async def _authenticate_user_from_token(
     Applies auth-specific rate limiting by client IP on failure bursts.
     """
     client_ip = request.client.host if request.client else "unknown"
-
-    # Brute-force protection (auth attempts)
     lockout_seconds = int(getattr(settings, "AUTH_LOCKOUT_SECONDS", 300))
-    if await rate_limit_svc.is_auth_rate_limited(
-        client_ip,
-        max_attempts=5,
-    ):
-        raise RateLimitExceeded(
-            detail="Too many failed authentication attempts.",
-            retry_after=lockout_seconds,
-        )
 
-    # Verify token
+    # Verify the signature/claims locally first; the revocation lookup is
+    # batched with the other Redis reads below.
     try:
         payload = await token_manager.verify_token(
-            token, expected_type=TokenType.ACCESS
+            token, expected_type=TokenType.ACCESS, check_revocation=False
         )
         sub = payload.get("sub")
         if sub is None:
@@ -88,13 +97,52 @@ async def _authenticate_user_from_token(
             )
         user_id = uuid.UUID(sub)
     except InvalidToken:
+        # Locked-out clients keep getting 429, whatever they send
+        await _raise_if_auth_locked(rate_limit_svc, client_ip, lockout_seconds)
         await rate_limit_svc.record_failed_auth_attempt(
             client_ip, lockout_duration=lockout_seconds
         )
         raise
 
-    # Load user
-    user = await user_svc.get_user_for_auth(db=db, user_id=user_id)
+    # One round trip: failed-auth counter, revocation flag and cached user
+    jti = payload.get("jti")
+    check_revoked = bool(
+        token_manager.config.ENABLE_TOKEN_BLACKLIST
+        and jti
+        and token_manager.may_be_revoked(jti)
+    )
+
+    def _auth_reads(pipe) -> None:
+        pipe.get(rate_limit_svc.failed_auth_key(client_ip))
+        if check_revoked:
+            pipe.exists(token_manager.revoked_token_key(jti))
+
+    try:
+        user, results = await cache_service.get_with(User, user_id, _auth_reads)
+        failed_attempts = results[0]
+        revoked = bool(results[1]) if check_revoked else False
+        has_failures = failed_attempts is not None
+    except Exception:
+        logger.warning("Batched auth lookup failed; checking one by one.", exc_info=True)
+        # Each check applies its own failure policy (fail-open / fail-secure)
+        await _raise_if_auth_locked(rate_limit_svc, client_ip, lockout_seconds)
+        revoked = check_revoked and await token_manager.is_token_revoked(jti)
+        user = None
+        failed_attempts = None
+        has_failures = True  # unknown, so clear on success
+
+    # Brute-force protection (auth attempts)
+    if failed_attempts and int(failed_attempts) >= _MAX_FAILED_AUTH_ATTEMPTS:
+        raise RateLimitExceeded(
+            detail="Too many failed authentication attempts.",
+            retry_after=lockout_seconds,
+        )
+    if revoked:
+        raise TokenRevoked()
+
+    # Load user (cache miss)
+    if user is None:
+        user = await user_svc.get_user_for_auth(db=db, user_id=user_id)
     if not user:
         # Treat unknown user as a not found (and not as auth failure) to avoid info leaks
         raise ResourceNotFound(resource_type="User", resource_id=str(user_id))
@@ -129,8 +177,9 @@ async def _authenticate_user_from_token(
             await rate_limit_svc.record_failed_auth_attempt(client_ip)
             raise TokenRevoked()
 
-    # Success path: clear failures and attach to request
-    await rate_limit_svc.clear_failed_auth_attempts(client_ip)
+    # Success path: clear failures (only if there are any) and attach to request
+    if has_failures:
+        await rate_limit_svc.clear_failed_auth_attempts(client_ip)
     request.state.user = user
     request.state.user_id = str(user.id)
     return user
@@ -247,13 +296,22 @@ class RateLimitChecker:
         else:
             identifier = f"ip:{request.client.host if request.client else 'unknown'}"
 
-        if await rate_limit_svc.is_rate_limited(
+        result = await rate_limit_svc.check_rate_limit(
             identifier, self.max_requests, self.window_seconds
-        ):
+        )
+
+        # Picked up by the logging middleware and added to whatever response
+        # goes out (including the 429 and handlers that return a raw Response).
+        # With several limiters on one route, report the tightest one.
+        current = getattr(request.state, "rate_limit", None)
+        if current is None or result.remaining <= current.remaining:
+            request.state.rate_limit = result
+
+        if result.limited:
             logger.warning(f"Rate limit exceeded for {identifier}")
             raise RateLimitExceeded(
                 detail=f"Rate limit exceeded. Maximum {self.max_requests} requests per {self.window_seconds} seconds.",
-                retry_after=self.window_seconds,
+                retry_after=max(math.ceil(result.retry_after), 1),
             )
 
 
@@ -285,9 +343,15 @@ class PaginationParams:
             le=int(getattr(settings, "MAX_PAGE_SIZE", 100)),
             description="Page size",
         ),
+        cursor: Optional[str] = Query(
+            None,
+            max_length=512,
+            description="next_cursor from the previous page (overrides page)",
+        ),
     ):
         self.page = page
         self.size = size
+        self.cursor = cursor
         self.skip = (page - 1) * size
         self.limit = size
 
@@ -300,9 +364,14 @@ async def get_pagination_params(
         le=int(getattr(settings, "MAX_PAGE_SIZE", 100)),
         description="Page size",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=512,
+        description="next_cursor from the previous page (overrides page)",
+    ),
 ) -> PaginationParams:
     """Get pagination parameters as a dependency."""
-    return PaginationParams(page=page, size=size)
+    return PaginationParams(page=page, size=size, cursor=cursor)
 
 
 # ================== HEALTH CHECK ==================